@@ -0,0 +1,153 @@
+"""Sprites scaled to their on-screen size, cached on disk.
+
+Decoding luke.png and vader.png (several hundred pixels a side) and scaling
+them down to 100x100 is most of the game's startup time. ``SpriteCache``
+stores the scaled pixels under a key made of the source file's content hash
+and the target size, so later launches (and any other process using the
+same cache directory) read a few kilobytes of raw pixels instead. A source
+is only decoded again when its bytes change or a new size is asked for.
+
+``AssetRegistry`` runs such loads on a background thread, so the window can
+show the menu while the sprites are still being read.
+"""
+
+import glob
+import hashlib
+import os
+import threading
+import time
+
+import pygame
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+LUKE_IMAGE = os.path.join(ASSET_DIR, "luke.png")
+VADER_IMAGE = os.path.join(ASSET_DIR, "vader.png")
+DEFAULT_CACHE_DIR = os.path.join(ASSET_DIR, ".sprite_cache")
+
+# Byte layout of a cache file: width * height pixels, 4 bytes each
+_PIXEL_FORMAT = "RGBA"
+_BYTES_PER_PIXEL = 4
+
+
+class SpriteCache:
+    """Scaled sprites, read from ``cache_dir`` or decoded and written there on a miss.
+
+    ``load()`` also keeps every surface it returns, so asking for the same
+    sprite and size again (e.g. when switching back to a difficulty tier)
+    costs a dict lookup. ``hits`` counts sprites read from disk and
+    ``misses`` sprites decoded from their source.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._digests = {} # Source path -> content hash, hashed once per process
+        self._surfaces = {} # (source path, size) -> Surface
+
+    def load(self, path, size):
+        """Return the image at ``path`` scaled to ``size`` (width, height).
+
+        The surface is converted to the display's format when a display is
+        open. Raises ``OSError`` or ``pygame.error`` if ``path`` can't be
+        read or decoded.
+        """
+        key = (path, size)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = self._load(path, size)
+        return surface
+
+    def cache_path(self, path, size):
+        """Where the pixels of ``path`` scaled to ``size`` are kept."""
+        digest = self._digests.get(path)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = self._digests[path] = hashlib.sha1(f.read()).hexdigest()
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}-{digest[:16]}-{size[0]}x{size[1]}.rgba")
+
+    def _load(self, path, size):
+        cache_path = self.cache_path(path, size)
+        try:
+            with open(cache_path, "rb") as f:
+                pixels = f.read()
+        except OSError:
+            pixels = None
+        if pixels is not None and len(pixels) == size[0] * size[1] * _BYTES_PER_PIXEL:
+            self.hits += 1
+            surface = pygame.image.frombytes(pixels, size, _PIXEL_FORMAT)
+        else:
+            self.misses += 1
+            surface = pygame.transform.scale(pygame.image.load(path), size)
+            self._store(cache_path, pygame.image.tobytes(surface, _PIXEL_FORMAT))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def _store(self, cache_path, pixels):
+        # Write to a private file and rename it into place, so another process
+        # never reads half a sprite. A cache that can't be written is skipped.
+        name, _, size = cache_path.rsplit("-", 2)
+        stale_pattern = f"{glob.escape(name)}-*-{glob.escape(size)}"
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(pixels)
+            os.replace(temp_path, cache_path)
+            # Drop this sprite's entries for older versions of the art
+            for stale in glob.glob(stale_pattern):
+                if stale != cache_path:
+                    os.remove(stale)
+        except OSError:
+            pass
+
+
+class AssetRegistry:
+    """Named assets filled in by a background thread.
+
+    ``load_in_background()`` starts the thread; ``get(name)`` returns an
+    asset, waiting only if it isn't loaded yet. ``load_seconds[name]`` is how
+    long each loader ran and ``wait_seconds`` how long ``get()`` has blocked
+    in total.
+    """
+
+    def __init__(self):
+        self.load_seconds = {}
+        self.wait_seconds = 0.0
+        self._assets = {}
+        self._errors = {}
+        self._loaded = threading.Condition()
+
+    def load_in_background(self, loaders):
+        """Run each ``name: loader`` of ``loaders`` in order on a daemon thread; return the thread."""
+        thread = threading.Thread(target=self._load_all, args=(dict(loaders),), name="asset-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_all(self, loaders):
+        for name, loader in loaders.items():
+            started = time.perf_counter()
+            try:
+                asset, error = loader(), None
+            except Exception as e: # Re-raised by get() in the thread that needs the asset
+                asset, error = None, e
+            with self._loaded:
+                self.load_seconds[name] = time.perf_counter() - started
+                if error is None:
+                    self._assets[name] = asset
+                else:
+                    self._errors[name] = error
+                self._loaded.notify_all()
+
+    def get(self, name):
+        """Return the asset ``name``, waiting for its loader if needed; re-raise the loader's error."""
+        with self._loaded:
+            if name not in self._assets and name not in self._errors:
+                started = time.perf_counter()
+                self._loaded.wait_for(lambda: name in self._assets or name in self._errors)
+                self.wait_seconds += time.perf_counter() - started
+            if name in self._errors:
+                raise self._errors[name]
+            return self._assets[name]
@@ -0,0 +1,355 @@
+"""Fixed-capacity storage for beams.
+
+A ``BeamPool`` keeps the top-left corners of same-sized beams in parallel,
+preallocated lists instead of a growing list of rectangles. ``live`` holds
+every slot number once: the first ``count`` are in flight and the rest are
+the free list, so a beam keeps its slot for its whole flight and removing one
+is an O(1) swap with the last live slot. Memory stays flat however many beams are fired,
+and a frame costs time proportional to the beams actually on screen.
+
+Beams only ever fly vertically, so a pool can also keep them bucketed by
+x-column (``ColumnBuckets``). A hit test then only looks at the beams in the
+target's horizontal span instead of every beam on screen.
+
+``RectBeamPool`` offers the same interface on top of pygame-ce: its rects sit
+in a frame that moves with the beams, so a frame's update is a handful of
+``Rect.collidelistall`` calls instead of one Python iteration per beam. The
+rects themselves are recycled through a ``RectPool`` rather than created per
+shot and dropped on every hit.
+"""
+
+from itertools import repeat
+from operator import add, attrgetter
+
+# Coordinate far outside the screen, for rects that stand in for half-planes.
+# Rects hold 32-bit ints, so RectBeamPool also rebases its moving frame before
+# the offset grows past this.
+_FAR = 1 << 24
+
+
+class ColumnBuckets:
+    """Slots grouped by the screen column their left edge falls in.
+
+    Items are ``item_width`` wide and must not move horizontally while they
+    are bucketed. ``near(left, right)`` returns every item that may overlap
+    the span ``[left, right)``.
+    """
+
+    def __init__(self, screen_width, column_width, item_width):
+        self.column_width = column_width
+        self.item_width = item_width
+        self.columns = [set() for _ in range(screen_width // column_width + 1)]
+        self._last = len(self.columns) - 1
+
+    def _column(self, x):
+        column = x // self.column_width
+        return 0 if column < 0 else min(column, self._last)
+
+    def add(self, slot, x):
+        self.columns[self._column(x)].add(slot)
+
+    def discard(self, slot, x):
+        self.columns[self._column(x)].discard(slot)
+
+    def clear(self):
+        for column in self.columns:
+            column.clear()
+
+    def near(self, left, right):
+        """Yield the slots in every column an item overlapping ``[left, right)`` could start in."""
+        columns = self.columns
+        for column in range(self._column(left - self.item_width + 1), self._column(right - 1) + 1):
+            yield from columns[column]
+
+
+class BeamPool:
+    """Up to ``capacity`` beams, addressed by slot number.
+
+    ``x[slot]``/``y[slot]``/``active[slot]`` describe one beam. The slots
+    currently in flight are ``live[0:count]`` in no particular order;
+    ``live[count:]`` are free.
+    Spawning into a full pool drops the shot and counts it in ``dropped``.
+
+    Pass ``buckets`` (a ``ColumnBuckets``) to keep the beams bucketed by
+    column for ``near()``.
+    """
+
+    def __init__(self, capacity, width, height, buckets=None):
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.x = [0] * capacity
+        self.y = [0] * capacity
+        self.active = [False] * capacity
+        self.live = list(range(capacity))
+        self._live_index = list(range(capacity)) # Position of each slot within live
+        self.count = 0
+        self.dropped = 0
+        self.buckets = buckets
+
+    def clear(self):
+        """Remove every beam."""
+        active, live = self.active, self.live
+        for i in range(self.count):
+            active[live[i]] = False
+        self.count = 0
+        if self.buckets is not None:
+            self.buckets.clear()
+
+    def spawn(self, x, y):
+        """Add a beam with its top-left corner at (x, y) and return its slot, or -1 if full."""
+        if self.count == self.capacity:
+            self.dropped += 1
+            return -1
+        slot = self.live[self.count]
+        self.x[slot] = x
+        self.y[slot] = y
+        self.active[slot] = True
+        self.count += 1
+        if self.buckets is not None:
+            self.buckets.add(slot, x)
+        return slot
+
+    def kill(self, slot):
+        """Remove the beam in ``slot`` by swapping the last live slot into its place."""
+        index = self._live_index[slot]
+        self.count -= 1
+        last = self.live[self.count]
+        self.live[index] = last
+        self._live_index[last] = index
+        self.live[self.count] = slot
+        self._live_index[slot] = self.count
+        self.active[slot] = False
+        if self.buckets is not None:
+            self.buckets.discard(slot, self.x[slot])
+
+    def advance(self, dy, target, min_y, max_y):
+        """Move every beam down by ``dy`` and drop the ones that hit ``target`` or leave ``[min_y, max_y]``.
+
+        ``target`` is a ``(left, top, width, height)`` rect; overlap follows
+        ``pygame.Rect.colliderect``. Returns how many beams hit it.
+        """
+        left, top, target_width, target_height = target
+        right = left + target_width
+        bottom = top + target_height
+        width, height = self.width, self.height
+        xs, ys, live = self.x, self.y, self.live
+        hits = 0
+        # Walking live slots backwards keeps swap-removal from skipping any
+        for i in range(self.count - 1, -1, -1):
+            slot = live[i]
+            x = xs[slot]
+            y = ys[slot] = ys[slot] + dy
+            if x < right and x + width > left and y < bottom and y + height > top:
+                hits += 1
+                self.kill(slot)
+            elif y < min_y or y > max_y:
+                self.kill(slot)
+        return hits
+
+    def shift(self, dy):
+        """Move every beam down by ``dy`` without any checks."""
+        ys, live = self.y, self.live
+        for i in range(self.count):
+            ys[live[i]] += dy
+
+    def move(self, dy, min_y, max_y):
+        """Move every beam down by ``dy`` and drop the ones that leave ``[min_y, max_y]``.
+
+        Like ``advance()`` without a target, for callers that hit-test
+        several targets through ``near()`` afterwards.
+        """
+        ys, live = self.y, self.live
+        for i in range(self.count - 1, -1, -1):
+            slot = live[i]
+            y = ys[slot] = ys[slot] + dy
+            if y < min_y or y > max_y:
+                self.kill(slot)
+
+    def near(self, left, right):
+        """Return the slots of beams that may overlap the columns ``[left, right)``.
+
+        Uses the column buckets when the pool has them, otherwise every live slot.
+        """
+        if self.buckets is not None:
+            return self.buckets.near(left, right)
+        return self.live[:self.count]
+
+    def corners(self):
+        """Return the live beams' corners as a flat ``[x0, y0, x1, y1, ...]`` list."""
+        x, y = self.x, self.y
+        flat = []
+        for slot in self.live[:self.count]:
+            flat += (x[slot], y[slot])
+        return flat
+
+    def load_corners(self, flat, start, count):
+        """Replace the contents with ``count`` beams read from ``flat[start:]`` (as made by ``corners()``)."""
+        self.clear()
+        x, y, live, active = self.x, self.y, self.live, self.active
+        count = min(count, self.capacity)
+        for i in range(count):
+            slot = live[i]
+            x[slot] = flat[start + 2 * i]
+            y[slot] = flat[start + 2 * i + 1]
+            active[slot] = True
+            if self.buckets is not None:
+                self.buckets.add(slot, x[slot])
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Iterate over the (x, y) corner of every beam in flight."""
+        # zip and map walk the slots in C, which matters when drawing thousands of beams
+        live = self.live[:self.count]
+        return zip(map(self.x.__getitem__, live), map(self.y.__getitem__, live))
+
+
+class RectPool:
+    """Recycled ``pygame.Rect``s of one size.
+
+    ``acquire()`` moves a released rect to the requested corner and only
+    creates a new one when none is free; ``release()`` hands it back.
+    ``hits`` counts acquires served from the free list and ``misses`` the
+    ones that had to allocate, so ``misses`` settles at the most rects ever
+    out at once, which is the ``prefill`` that avoids allocating at all.
+    """
+
+    def __init__(self, width, height, prefill=0):
+        import pygame
+        self._rect = pygame.Rect
+        self.width = width
+        self.height = height
+        self.free = [self._rect(0, 0, width, height) for _ in range(prefill)]
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, x, y):
+        """Return a rect with its top-left corner at (x, y)."""
+        if self.free:
+            self.hits += 1
+            rect = self.free.pop()
+            rect.x = x
+            rect.y = y
+            return rect
+        self.misses += 1
+        return self._rect(x, y, self.width, self.height)
+
+    def release(self, rect):
+        """Take back a rect from ``acquire()``; the caller must not use it afterwards."""
+        self.free.append(rect)
+
+    def release_all(self, rects):
+        """Take back every rect in ``rects``."""
+        self.free += rects
+
+
+class RectBeamPool:
+    """Up to ``capacity`` beams kept as ``pygame.Rect``s, with ``BeamPool``'s interface.
+
+    All beams in a pool fly at the same speed, so the rects are stored
+    relative to a moving frame: a beam's screen y is ``rect.y + offset``.
+    Moving every beam is then a single addition to ``offset``, and the hit
+    test and the off-screen cull are one ``collidelistall`` call each. Needs
+    pygame-ce, which is only imported when a pool is created so headless
+    users of this module never load it. Slots are list positions and change
+    as beams are removed.
+
+    Beam rects come from ``rect_pool`` (a ``RectPool``) and go back to it
+    when the beam is removed; its ``hits``/``misses`` show how well it is sized.
+    """
+
+    def __init__(self, capacity, width, height, rect_pool=None):
+        import pygame
+        # Scratch rects for the hit test and the off-screen cull, reused every frame
+        self._target = pygame.Rect(0, 0, 0, 0)
+        self._above = pygame.Rect(0, 0, 0, 0)
+        self._below = pygame.Rect(0, 0, 0, 0)
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.rect_pool = rect_pool if rect_pool is not None else RectPool(width, height)
+        self.rects = []
+        self.offset = 0
+        self.dropped = 0
+
+    @property
+    def count(self):
+        return len(self.rects)
+
+    def clear(self):
+        """Remove every beam."""
+        self.rect_pool.release_all(self.rects)
+        self.rects.clear()
+        self.offset = 0
+
+    def spawn(self, x, y):
+        """Add a beam with its top-left corner at (x, y) and return its slot, or -1 if full."""
+        if len(self.rects) == self.capacity:
+            self.dropped += 1
+            return -1
+        if not self.rects:
+            self.offset = 0
+        self.rects.append(self.rect_pool.acquire(x, y - self.offset))
+        return len(self.rects) - 1
+
+    def advance(self, dy, target, min_y, max_y):
+        """Move every beam down by ``dy`` and drop the ones that hit ``target`` or leave ``[min_y, max_y]``.
+
+        Same contract as ``BeamPool.advance()``.
+        """
+        self.offset += dy
+        rects = self.rects
+        if not rects:
+            return 0
+        if not -_FAR < self.offset < _FAR:
+            self._rebase()
+        offset = self.offset
+        left, top, target_width, target_height = target
+        self._target.update(left, top - offset, target_width, target_height)
+        hit = self._target.collidelistall(rects)
+        # Rects standing in for "top above min_y" and "top below max_y"
+        self._above.update(-_FAR, -_FAR, 2 * _FAR, min_y - offset + _FAR)
+        self._below.update(-_FAR, max_y - offset + self.height, 2 * _FAR, _FAR)
+        dead = self._above.collidelistall(rects)
+        dead += self._below.collidelistall(rects)
+        if hit or dead:
+            release = self.rect_pool.release
+            for index in sorted(set(hit).union(dead), reverse=True):
+                release(rects.pop(index))
+        return len(hit)
+
+    def shift(self, dy):
+        """Move every beam down by ``dy`` without any checks."""
+        self.offset += dy
+
+    def _rebase(self):
+        """Fold ``offset`` into the rects so it starts again from zero."""
+        offset = self.offset
+        for rect in self.rects:
+            rect.y += offset
+        self.offset = 0
+
+    def corners(self):
+        """Return the live beams' corners as a flat ``[x0, y0, x1, y1, ...]`` list."""
+        offset = self.offset
+        flat = []
+        for rect in self.rects:
+            flat += (rect.x, rect.y + offset)
+        return flat
+
+    def load_corners(self, flat, start, count):
+        """Replace the contents with ``count`` beams read from ``flat[start:]`` (as made by ``corners()``)."""
+        self.clear()
+        acquire = self.rect_pool.acquire
+        self.rects += [acquire(flat[start + 2 * i], flat[start + 2 * i + 1]) for i in range(min(count, self.capacity))]
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __iter__(self):
+        """Iterate over the (x, y) corner of every beam in flight."""
+        rects = self.rects
+        return zip(map(attrgetter("x"), rects), map(add, map(attrgetter("y"), rects), repeat(self.offset)))
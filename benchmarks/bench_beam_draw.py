@@ -0,0 +1,75 @@
+"""Drawing N beams per frame: one ``pygame.draw.rect`` per beam against one ``fblits`` call.
+
+Beams sit in a ``BeamPool`` in fixed-point units, as in the game. Compared
+are the original loop (``to_pixels`` and ``draw.rect`` for every beam) and
+``render.BeamSprite`` positions blitted in one ``DirtyRects.blits()`` call,
+with and without the glow. Uses SDL's dummy video driver unless
+SDL_VIDEODRIVER is set.
+
+Run from the repository root:
+
+    python benchmarks/bench_beam_draw.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame # noqa: E402
+
+from beams import BeamPool # noqa: E402
+from render import BeamSprite, DirtyRects # noqa: E402
+from duel import (  # noqa: E402
+    SCREEN_WIDTH, SCREEN_HEIGHT, BEAM_WIDTH, BEAM_HEIGHT, SCREEN_WIDTH_FX, SCREEN_HEIGHT_FX,
+    BEAM_WIDTH_FX, BEAM_HEIGHT_FX, to_pixels,
+)
+
+BEAM_COUNTS = (10, 100, 1000, 5000)
+FRAMES = 200
+COLOR = (0, 0, 255)
+
+
+def make_beams(n):
+    rng = random.Random(n)
+    pool = BeamPool(n, BEAM_WIDTH_FX, BEAM_HEIGHT_FX)
+    for _ in range(n):
+        pool.spawn(rng.randrange(SCREEN_WIDTH_FX - BEAM_WIDTH_FX), rng.randrange(SCREEN_HEIGHT_FX))
+    return pool
+
+
+def run_draw_rect(screen, beams):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for x, y in beams:
+            pygame.draw.rect(screen, COLOR, (to_pixels(x), to_pixels(y), BEAM_WIDTH, BEAM_HEIGHT))
+    return (time.perf_counter() - start) / FRAMES
+
+
+def run_fblits(screen, beams, glow):
+    renderer = DirtyRects(screen, (0, 0, 0))
+    sprite = BeamSprite(COLOR, BEAM_WIDTH, BEAM_HEIGHT, glow)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        renderer.blits(sprite.surface, sprite.dests(beams))
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    for n in BEAM_COUNTS:
+        beams = make_beams(n)
+        per_rect = run_draw_rect(screen, beams)
+        batched = run_fblits(screen, beams, 0)
+        glowing = run_fblits(screen, beams, 3)
+        print(f"{n:>5} beams: draw.rect {per_rect * 1e6:9.1f} us/frame, fblits {batched * 1e6:8.1f} us/frame "
+              f"({per_rect / batched:.1f}x), fblits with glow {glowing * 1e6:8.1f} us/frame")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Per-frame beam update cost: the old list-of-Rect loop against BeamPool.
+
+Each frame moves every live beam, retires the ones that pass y < 0 and fires
+replacements, so the number of live beams stays at N. The old loop iterates
+a slice copy and calls list.remove(); the pool's own ``BeamPool.move()``, as
+``DuelWorld`` runs it, swap-removes in O(1).
+
+Run from the repository root:
+
+    python benchmarks/bench_beam_pool.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beams import BeamPool # noqa: E402
+
+BEAM_COUNTS = (10, 100, 1000, 5000)
+FRAMES = 200
+SPEED = -10
+START_Y = 500
+
+
+def make_pool(n):
+    pool = BeamPool(n, 5, 20)
+    for i in range(n):
+        pool.spawn(i % 640, START_Y - (i * 10) % START_Y)
+    return pool
+
+
+def run_pool(pool):
+    n = pool.capacity
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        pool.move(SPEED, 0, START_Y)
+        while pool.count < n:
+            pool.spawn(0, START_Y)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def run_rect_list(n):
+    import pygame
+    beams = [pygame.Rect(i % 640, START_Y - (i * 10) % START_Y, 5, 20) for i in range(n)]
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for beam in beams[:]:
+            beam.y += SPEED
+            if beam.y < 0:
+                beams.remove(beam)
+        while len(beams) < n:
+            beams.append(pygame.Rect(0, START_Y, 5, 20))
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    try:
+        import pygame # noqa: F401
+    except ImportError:
+        pygame = None
+        print("pygame not installed, only BeamPool is measured")
+    for n in BEAM_COUNTS:
+        line = f"{n:>5} beams  BeamPool {run_pool(make_pool(n)) * 1e6:>9.1f} us/frame"
+        if pygame is not None:
+            line += f"  Rect list {run_rect_list(n) * 1e6:>9.1f} us/frame"
+        print(line)
+
+    # Built and filled before tracing starts, then one warm-up run so every beam's y is an int
+    # allocated under tracing; the second run should then neither grow memory nor spike it.
+    pool = make_pool(BEAM_COUNTS[-1])
+    tracemalloc.start()
+    run_pool(pool)
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    run_pool(pool)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"BeamPool memory while running with {BEAM_COUNTS[-1]} beams: "
+          f"{(current - before) / 1024:+.1f} KiB kept, {(peak - before) / 1024:.1f} KiB peak above warm-up")
+
+
+if __name__ == "__main__":
+    main()
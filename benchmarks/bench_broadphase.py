@@ -0,0 +1,82 @@
+"""Hit-testing entities against beams: every beam vs. column buckets.
+
+Each frame, every entity (100x100, like Luke or Vader) looks for beams that
+overlap it. Brute force tests every live beam; the bucketed pool only tests
+beams in the entity's columns. The output shows where bucketing starts to
+pay off for a given number of entities.
+
+Run from the repository root:
+
+    python benchmarks/bench_broadphase.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beams import BeamPool, ColumnBuckets # noqa: E402
+from duel import SCREEN_WIDTH, SCREEN_HEIGHT, BEAM_WIDTH, BEAM_HEIGHT # noqa: E402
+
+ENTITY_SIZE = 100
+COLUMN_WIDTH = 32
+BEAM_COUNTS = (4, 16, 64, 256, 1024, 4096)
+ENTITY_COUNTS = (1, 10, 100)
+REPEAT = 20
+
+
+def fill(pool, n, rng):
+    for _ in range(n):
+        pool.spawn(rng.randrange(SCREEN_WIDTH - BEAM_WIDTH), rng.randrange(SCREEN_HEIGHT))
+
+
+def count_hits(pool, entities, slots_for):
+    xs, ys = pool.x, pool.y
+    hits = 0
+    for ex, ey in entities:
+        for slot in slots_for(ex):
+            x, y = xs[slot], ys[slot]
+            if x < ex + ENTITY_SIZE and x + BEAM_WIDTH > ex and y < ey + ENTITY_SIZE and y + BEAM_HEIGHT > ey:
+                hits += 1
+    return hits
+
+
+def measure(n, entity_count):
+    rng = random.Random(n * 1000 + entity_count)
+    entities = [(rng.randrange(SCREEN_WIDTH - ENTITY_SIZE), rng.randrange(SCREEN_HEIGHT - ENTITY_SIZE))
+                for _ in range(entity_count)]
+    plain = BeamPool(n, BEAM_WIDTH, BEAM_HEIGHT)
+    bucketed = BeamPool(n, BEAM_WIDTH, BEAM_HEIGHT, ColumnBuckets(SCREEN_WIDTH, COLUMN_WIDTH, BEAM_WIDTH))
+    fill(plain, n, random.Random(n))
+    fill(bucketed, n, random.Random(n))
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        brute = count_hits(plain, entities, lambda ex: plain.live[:plain.count])
+    brute_time = (time.perf_counter() - start) / REPEAT
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        near = count_hits(bucketed, entities, lambda ex: bucketed.near(ex, ex + ENTITY_SIZE))
+    bucket_time = (time.perf_counter() - start) / REPEAT
+
+    assert brute == near
+    return brute_time, bucket_time
+
+
+def main():
+    for entity_count in ENTITY_COUNTS:
+        print(f"{entity_count} entities")
+        crossover = None
+        for n in BEAM_COUNTS:
+            brute_time, bucket_time = measure(n, entity_count)
+            if crossover is None and bucket_time < brute_time:
+                crossover = n
+            print(f"  {n:>5} beams  all beams {brute_time * 1e6:>9.1f} us  buckets {bucket_time * 1e6:>9.1f} us")
+        print(f"  buckets win from {crossover} beams" if crossover else "  buckets never win in this range")
+
+
+if __name__ == "__main__":
+    main()
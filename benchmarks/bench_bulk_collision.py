@@ -0,0 +1,87 @@
+"""Per-frame beam update: per-beam Python loops against pygame-ce bulk queries.
+
+Every frame, N of Luke's beams move up, are tested against Vader and the
+ones above the screen are culled; replacements keep N beams in flight.
+Compared are the original game loop (list of Rects, slice copy and
+list.remove), ``BeamPool.advance`` (one fused Python loop) and
+``RectBeamPool.advance`` (one ``collidelistall`` per query), and how often
+``RectBeamPool``'s rect recycling had to allocate.
+
+Run from the repository root:
+
+    python benchmarks/bench_bulk_collision.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame # noqa: E402
+
+from beams import BeamPool, RectBeamPool # noqa: E402
+from duel import (  # noqa: E402
+    SCREEN_WIDTH, SCREEN_HEIGHT, BEAM_WIDTH, BEAM_HEIGHT, PLAYER_BEAM_SPEED,
+    DODGER_WIDTH, DODGER_HEIGHT, initial_vader_x, initial_vader_y, initial_luke_y,
+)
+
+BEAM_COUNTS = (10, 100, 1000)
+FRAMES = 300
+VADER = (initial_vader_x, initial_vader_y, DODGER_WIDTH, DODGER_HEIGHT)
+
+
+def starting_beams(n):
+    rng = random.Random(n)
+    return [(rng.randrange(SCREEN_WIDTH - BEAM_WIDTH), rng.randrange(initial_luke_y)) for _ in range(n)], rng
+
+
+def run_original_loop(n):
+    beams, rng = starting_beams(n)
+    player_beams = [pygame.Rect(x, y, BEAM_WIDTH, BEAM_HEIGHT) for x, y in beams]
+    vader_rect = pygame.Rect(VADER)
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for beam in player_beams[:]:
+            beam.y += PLAYER_BEAM_SPEED
+            if beam.y < 0:
+                player_beams.remove(beam)
+            elif beam.colliderect(vader_rect):
+                hits += 1
+                player_beams.remove(beam)
+        while len(player_beams) < n:
+            player_beams.append(pygame.Rect(rng.randrange(SCREEN_WIDTH - BEAM_WIDTH), initial_luke_y,
+                                            BEAM_WIDTH, BEAM_HEIGHT))
+    return (time.perf_counter() - start) / FRAMES, hits
+
+
+def run_pool(pool_class, n):
+    beams, rng = starting_beams(n)
+    pool = pool_class(n, BEAM_WIDTH, BEAM_HEIGHT)
+    for x, y in beams:
+        pool.spawn(x, y)
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        hits += pool.advance(PLAYER_BEAM_SPEED, VADER, 0, SCREEN_HEIGHT)
+        while pool.count < n:
+            pool.spawn(rng.randrange(SCREEN_WIDTH - BEAM_WIDTH), initial_luke_y)
+    return (time.perf_counter() - start) / FRAMES, hits, pool
+
+
+def main():
+    for n in BEAM_COUNTS:
+        original, hits = run_original_loop(n)
+        pooled, pooled_hits, _ = run_pool(BeamPool, n)
+        bulk, bulk_hits, pool = run_pool(RectBeamPool, n)
+        assert hits == pooled_hits == bulk_hits
+        rects = pool.rect_pool
+        print(f"{n:>5} beams  original loop {original * 1e6:>8.1f} us  BeamPool {pooled * 1e6:>8.1f} us  "
+              f"RectBeamPool {bulk * 1e6:>8.1f} us  ({original / bulk:.1f}x vs original)  "
+              f"rects reused {rects.hits}, allocated {rects.misses}")
+
+
+if __name__ == "__main__":
+    main()
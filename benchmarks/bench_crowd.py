@@ -0,0 +1,51 @@
+"""Scaling of ``CrowdWorld`` with the number of Vaders and Lukes.
+
+Rule-based Vaders face scripted Lukes (``crowd.chasing_lukes``); a world
+whose game ends is reset and played again. Reported is the time per frame
+against the 16.7 ms a frame has at 60 FPS. Crowds are run twice: with
+every Luke firing at the usual rate, where the Vaders fall in about a
+second, and at a tenth of it, which keeps most of the crowd alive.
+
+Run from the repository root:
+
+    python benchmarks/bench_crowd.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crowd import CrowdWorld, chasing_lukes, LUKE_FIRE_CHANCE # noqa: E402
+
+FRAMES = 3000
+SIZES = ((1, 1), (10, 10), (100, 100), (100, 300))
+FRAME_BUDGET = 1 / 60
+
+
+def run(num_vaders, num_lukes, fire_chance):
+    world = CrowdWorld(num_vaders, num_lukes, seed=0)
+    games = 1
+    beams = 0
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        if world.step(chasing_lukes(world, fire_chance)):
+            world.reset()
+            games += 1
+        beams += world.player_beams.count + world.vader_beams.count
+    return (time.perf_counter() - start) / FRAMES, games, beams / FRAMES
+
+
+def main():
+    for fire_chance in (LUKE_FIRE_CHANCE, LUKE_FIRE_CHANCE / 10):
+        print(f"Lukes fire with chance {fire_chance:g} per frame")
+        for num_vaders, num_lukes in SIZES:
+            per_frame, games, beams = run(num_vaders, num_lukes, fire_chance)
+            print(f"  {num_vaders:>4} Vaders vs {num_lukes:>4} Lukes  {per_frame * 1e3:6.3f} ms/frame  "
+                  f"({per_frame / FRAME_BUDGET:5.1%} of a 60 FPS frame)  {beams:6.1f} beams on screen  "
+                  f"{games} games")
+
+
+if __name__ == "__main__":
+    main()
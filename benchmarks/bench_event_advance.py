@@ -0,0 +1,76 @@
+"""Frame-by-frame step() against event-driven advance() for scripted Luke.
+
+Luke holds each action for a random span of frames, as a scripted opponent
+or a policy with action repeat would. Both modes must end every episode in
+the same state.
+
+Run from the repository root:
+
+    python benchmarks/bench_event_advance.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duel import DuelWorld, ACTION_NONE, ACTION_LEFT, ACTION_RIGHT # noqa: E402
+
+EPISODES = 2000
+SPANS = (1, 8, 32, 128)
+
+
+def make_scripts(span):
+    rng = random.Random(span)
+    actions = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT)
+    return [[(rng.choice(actions), rng.randint(1, 2 * span)) for _ in range(200)] for _ in range(EPISODES)]
+
+
+def run_step(scripts):
+    world = DuelWorld()
+    frames = 0
+    outcomes = []
+    for script in scripts:
+        world.reset()
+        for action, length in script:
+            for _ in range(length):
+                if world.step(action):
+                    break
+                frames += 1
+            if world.game_over:
+                break
+        outcomes.append((world.luke_x, world.vader_x, world.luke_won))
+    return frames, outcomes
+
+
+def run_advance(scripts):
+    world = DuelWorld()
+    outcomes = []
+    for script in scripts:
+        world.reset()
+        for action, length in script:
+            if world.game_over:
+                break
+            world.advance(length, action)
+        outcomes.append((world.luke_x, world.vader_x, world.luke_won))
+    return outcomes
+
+
+def main():
+    for span in SPANS:
+        scripts = make_scripts(span)
+        start = time.perf_counter()
+        frames, expected = run_step(scripts)
+        step_time = time.perf_counter() - start
+        start = time.perf_counter()
+        outcomes = run_advance(scripts)
+        advance_time = time.perf_counter() - start
+        assert outcomes == expected, "advance() diverged from step()"
+        print(f"mean hold {span:>3} frames: step {frames / step_time:>11,.0f} frames/s, "
+              f"advance {frames / advance_time:>11,.0f} frames/s ({step_time / advance_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Throughput of ProcessVectorEnv as the number of worker processes grows.
+
+Run from the repository root:
+
+    python benchmarks/bench_process_env.py [num_envs]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_env import ProcessVectorEnv # noqa: E402
+
+STEPS = 500
+WORKER_COUNTS = (1, 2, 4, 8, 16)
+
+
+def measure(num_envs, num_workers):
+    actions = bytes(i % 3 for i in range(num_envs))
+    with ProcessVectorEnv(num_envs, num_workers=num_workers) as envs:
+        envs.reset()
+        start = time.perf_counter()
+        for _ in range(STEPS):
+            envs.step(actions)
+        return num_envs * STEPS / (time.perf_counter() - start)
+
+
+def main():
+    num_envs = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    cores = os.cpu_count() or 1
+    print(f"{num_envs} environments, {cores} cores")
+    base = None
+    for workers in WORKER_COUNTS:
+        if workers > cores:
+            break
+        rate = measure(num_envs, workers)
+        base = base or rate
+        print(f"{workers:>3} workers {rate:>12,.0f} env-steps/s  ({rate / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-frame drawing cost: full clear and flip against dirty rectangles.
+
+Each frame draws Luke, Vader and N beams moving across the window, the way
+the game loop does (the beams from one ``BeamSprite`` in a single
+``blits()`` call), through ``render.DirtyRects`` once with
+``full_redraw=True`` (fill and flip the whole window, as the game used to)
+and once tracking dirty rectangles. Uses SDL's dummy video driver unless
+SDL_VIDEODRIVER is set, so the numbers are the CPU side of rendering.
+
+Run from the repository root:
+
+    python benchmarks/bench_render.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame # noqa: E402
+
+from render import BeamSprite, DirtyRects # noqa: E402
+from duel import (  # noqa: E402
+    SCREEN_WIDTH, SCREEN_HEIGHT, BEAM_WIDTH, BEAM_HEIGHT, PLAYER_BEAM_SPEED,
+    PLAYER_WIDTH, PLAYER_HEIGHT, DODGER_WIDTH, DODGER_HEIGHT, initial_luke_y, initial_vader_y,
+)
+
+BEAM_COUNTS = (0, 10, 100, 1000)
+FRAMES = 600
+
+
+def run(screen, full_redraw, n):
+    rng = random.Random(n)
+    luke = pygame.Surface((PLAYER_WIDTH, PLAYER_HEIGHT))
+    luke.fill((0, 255, 0))
+    vader = pygame.Surface((DODGER_WIDTH, DODGER_HEIGHT))
+    vader.fill((255, 0, 0))
+    beam = BeamSprite((0, 0, 255), BEAM_WIDTH, BEAM_HEIGHT)
+    beams = [[rng.randrange(SCREEN_WIDTH - BEAM_WIDTH), rng.randrange(SCREEN_HEIGHT)] for _ in range(n)]
+    renderer = DirtyRects(screen, (0, 0, 0), full_redraw)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        renderer.begin()
+        renderer.blit(luke, (frame * 3 % (SCREEN_WIDTH - PLAYER_WIDTH), initial_luke_y))
+        renderer.blit(vader, (SCREEN_WIDTH - DODGER_WIDTH - frame * 4 % (SCREEN_WIDTH - DODGER_WIDTH), initial_vader_y))
+        for corner in beams:
+            corner[1] = (corner[1] + PLAYER_BEAM_SPEED) % SCREEN_HEIGHT
+        renderer.blits(beam.surface, beams)
+        renderer.present()
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"video driver: {pygame.display.get_driver()}")
+    for n in BEAM_COUNTS:
+        full = run(screen, True, n)
+        dirty = run(screen, False, n)
+        print(f"{n:>5} beams: full redraw {full * 1e6:8.1f} us/frame, "
+              f"dirty rects {dirty * 1e6:8.1f} us/frame ({full / dirty:.1f}x)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare per-duel throughput of one DuelWorld against a batched VectorDuel.
+
+Run from the repository root:
+
+    python benchmarks/bench_vector_duel.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duel import DuelWorld # noqa: E402
+from vector_duel import VectorDuel # noqa: E402
+
+STEPS = 200_000
+BATCH_SIZES = (256, 1024, 4096, 16384)
+
+
+def random_actions(rng, n):
+    return [rng.randrange(8) for _ in range(n)]
+
+
+def bench_single(steps):
+    rng = random.Random(0)
+    actions = random_actions(rng, 1024)
+    world = DuelWorld()
+    start = time.perf_counter()
+    for i in range(steps):
+        if world.step(actions[i & 1023]):
+            world.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector(n, use_numpy):
+    rng = random.Random(0)
+    actions = random_actions(rng, n)
+    if use_numpy:
+        import numpy as np
+        actions = np.array(actions, np.int32)
+    duels = VectorDuel(n, use_numpy=use_numpy)
+    frames = max(STEPS // n, 10)
+    start = time.perf_counter()
+    for i in range(frames):
+        done = duels.step(actions)
+        if i % 60 == 59:
+            duels.reset([j for j in range(n) if done[j]])
+    return n * frames / (time.perf_counter() - start)
+
+
+def main():
+    single = bench_single(STEPS)
+    print(f"DuelWorld            {single:>12,.0f} duel-steps/s")
+    backends = [False]
+    try:
+        import numpy # noqa: F401
+        backends.insert(0, True)
+    except ImportError:
+        print("NumPy not installed, only the array backend is measured")
+    for use_numpy in backends:
+        for n in BATCH_SIZES:
+            rate = bench_vector(n, use_numpy)
+            name = "numpy" if use_numpy else "array"
+            print(f"VectorDuel {name} {n:>6} {rate:>12,.0f} duel-steps/s  ({rate / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Checks that the simulation's fast paths still play the original game.
+
+Random episodes are replayed through each pair below, which must agree
+frame by frame:
+
+- the original game loop (pygame Rects, copied below) and ``DuelWorld``,
+  with both ``BeamPool`` and ``RectBeamPool``
+- ``DuelWorld.step()`` and ``DuelWorld.advance()``
+- ``DuelWorld`` and ``VectorDuel``, with NumPy (if installed) and without
+- ``DuelWorld.snapshot()`` and ``restore()``, including the state hashes
+- ``DuelWorld`` and a ``CrowdWorld`` with one Vader and one Luke
+
+On a hit the original loop drops only one of Luke's overlapping beams,
+while ``DuelWorld`` drops them all, so beams are not compared on the frame
+a duel ends. Any difference stops the script with the episode and frame.
+
+Run from the repository root after changing any of them:
+
+    python benchmarks/check_equivalence.py
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame # noqa: E402
+
+from beams import BeamPool, RectBeamPool # noqa: E402
+from crowd import CrowdWorld # noqa: E402
+from vector_duel import VectorDuel, PLAYER_BEAM_SLOTS, VADER_BEAM_SLOTS, np # noqa: E402
+from duel import (  # noqa: E402
+    DuelWorld, first_desync, FIXED_SHIFT, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE,
+    SCREEN_WIDTH, SCREEN_HEIGHT, BEAM_WIDTH, BEAM_HEIGHT, VADER_SHOT_INTERVAL,
+    PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_SPEED, PLAYER_BEAM_SPEED, initial_luke_x, initial_luke_y,
+    DODGER_WIDTH, DODGER_HEIGHT, DODGER_SPEED, DODGER_BEAM_SPEED, initial_vader_x, initial_vader_y,
+)
+
+EPISODES = 100
+MAX_FRAMES = 3000
+VECTOR_DUELS = 40
+VECTOR_FRAMES = 2500
+
+
+def random_actions(rng, frames):
+    """Luke's actions for one episode, firing at a random rate."""
+    fire_rate = rng.choice((0.0, 0.01, 0.05, 0.3))
+    actions = []
+    for _ in range(frames):
+        action = rng.choice((0, ACTION_LEFT, ACTION_RIGHT, ACTION_LEFT | ACTION_RIGHT))
+        if rng.random() < fire_rate:
+            action |= ACTION_FIRE
+        actions.append(action)
+    return actions
+
+
+def original_loop(actions):
+    """The game loop as game.py first wrote it, one state per frame in pixels."""
+    luke = pygame.Rect(initial_luke_x, initial_luke_y, PLAYER_WIDTH, PLAYER_HEIGHT)
+    vader = pygame.Rect(initial_vader_x, initial_vader_y, DODGER_WIDTH, DODGER_HEIGHT)
+    player_beams = []
+    vader_beams = []
+    vader_direction = 1
+    vader_shot_timer = 0
+    vader_alive = True
+    game_over = False
+    states = []
+    for action in actions:
+        if not game_over:
+            if action & ACTION_FIRE:
+                player_beams.append(pygame.Rect(luke.centerx - BEAM_WIDTH // 2, luke.top, BEAM_WIDTH, BEAM_HEIGHT))
+            if action & ACTION_LEFT:
+                luke.x -= PLAYER_SPEED
+            if action & ACTION_RIGHT:
+                luke.x += PLAYER_SPEED
+            if luke.left < 0:
+                luke.left = 0
+            if luke.right > SCREEN_WIDTH:
+                luke.right = SCREEN_WIDTH
+
+            if vader_alive:
+                vader.x += DODGER_SPEED * vader_direction
+                if vader.left < 0:
+                    vader.left = 0
+                    vader_direction = 1
+                elif vader.right > SCREEN_WIDTH:
+                    vader.right = SCREEN_WIDTH
+                    vader_direction = -1
+                vader_shot_timer += 1
+                if vader_shot_timer >= VADER_SHOT_INTERVAL:
+                    vader_shot_timer = 0
+                    vader_beams.append(pygame.Rect(vader.centerx - BEAM_WIDTH // 2, vader.bottom,
+                                                   BEAM_WIDTH, BEAM_HEIGHT))
+
+            for beam in player_beams[:]:
+                beam.y += PLAYER_BEAM_SPEED
+                if beam.y < 0:
+                    player_beams.remove(beam)
+                if vader_alive and beam.colliderect(vader):
+                    vader_alive = False
+                    game_over = True
+                    player_beams.remove(beam)
+            for beam in vader_beams[:]:
+                beam.y += DODGER_BEAM_SPEED
+                if beam.y > SCREEN_HEIGHT:
+                    vader_beams.remove(beam)
+                if beam.colliderect(luke):
+                    game_over = True
+                    vader_beams.remove(beam)
+        states.append((luke.x, vader.x, vader_direction, vader_shot_timer, vader_alive, game_over,
+                       sorted(beam.topleft for beam in player_beams), sorted(beam.topleft for beam in vader_beams)))
+    return states
+
+
+def duel_state(world, shift=0):
+    """A ``DuelWorld``'s state, positions shifted right by ``shift`` bits."""
+    def corners(beams):
+        return sorted((x >> shift, y >> shift) for x, y in beams)
+    return (world.luke_x >> shift, world.vader_x >> shift, world.vader_direction, world.vader_shot_timer,
+            world.vader_alive, world.game_over, corners(world.player_beams), corners(world.vader_beams))
+
+
+def vector_state(duels, i):
+    """Duel ``i`` of a ``VectorDuel``, in the shape of ``duel_state()``."""
+    player_y = duels.player_beam_y()
+    if duels.use_numpy:
+        player = zip(duels.player_beam_x[i], player_y, duels.player_beam_active[i])
+        vader = zip(duels.vader_beam_x[i], duels.vader_beam_y[i], duels.vader_beam_active[i])
+    else:
+        player_slots = slice(i * PLAYER_BEAM_SLOTS, (i + 1) * PLAYER_BEAM_SLOTS)
+        vader_slots = slice(i * VADER_BEAM_SLOTS, (i + 1) * VADER_BEAM_SLOTS)
+        player = zip(duels.player_beam_x[player_slots], player_y, duels.player_beam_active[player_slots])
+        vader = zip(duels.vader_beam_x[vader_slots], duels.vader_beam_y[vader_slots],
+                    duels.vader_beam_active[vader_slots])
+    return (int(duels.luke_x[i]), int(duels.vader_x[i]), int(duels.vader_direction[i]),
+            int(duels.vader_shot_timer[i]), bool(duels.vader_alive[i]), bool(duels.game_over[i]),
+            sorted((int(x), int(y)) for x, y, active in player if active),
+            sorted((int(x), int(y)) for x, y, active in vader if active))
+
+
+def same(a, b):
+    """Whether two states agree, leaving out the beams once the duel is over."""
+    if a[5]:
+        return a[:6] == b[:6]
+    return a == b
+
+
+def check_original_loop(beam_pool):
+    rng = random.Random(1)
+    for episode in range(EPISODES):
+        actions = random_actions(rng, rng.randint(50, MAX_FRAMES))
+        world = DuelWorld(beam_pool=beam_pool)
+        for frame, (action, expected) in enumerate(zip(actions, original_loop(actions))):
+            world.step(action)
+            assert same(expected, duel_state(world, FIXED_SHIFT)), \
+                f"{beam_pool.__name__}: episode {episode} left the original loop at frame {frame}"
+
+
+def check_advance():
+    rng = random.Random(5)
+    for episode in range(EPISODES * 10):
+        stepped = DuelWorld()
+        advanced = DuelWorld()
+        for _ in range(rng.randint(1, 30)):
+            if stepped.game_over:
+                break
+            if rng.random() < 0.5:
+                stepped.step(ACTION_FIRE)
+                advanced.step(ACTION_FIRE)
+            action = rng.randrange(8) if rng.random() < 0.1 else rng.randrange(4)
+            frames = rng.randint(1, 300)
+            stepped_frames = 0
+            while stepped_frames < frames and not stepped.game_over:
+                stepped.step(action)
+                stepped_frames += 1
+            advanced_frames = advanced.advance(frames, action)
+            assert same(duel_state(stepped), duel_state(advanced)) and stepped_frames == advanced_frames, \
+                f"episode {episode}: advance({frames}, {action}) diverged from step()"
+
+
+def check_vector(use_numpy):
+    rng = random.Random(3)
+    actions = [random_actions(rng, VECTOR_FRAMES) for _ in range(VECTOR_DUELS)]
+    duels = VectorDuel(VECTOR_DUELS, use_numpy=use_numpy)
+    worlds = [DuelWorld() for _ in range(VECTOR_DUELS)]
+    for frame in range(VECTOR_FRAMES):
+        frame_actions = [duel_actions[frame] for duel_actions in actions]
+        duels.step(np.array(frame_actions) if use_numpy else frame_actions)
+        for i, world in enumerate(worlds):
+            world.step(frame_actions[i])
+            assert same(duel_state(world), vector_state(duels, i)), \
+                f"VectorDuel(use_numpy={use_numpy}): duel {i} diverged at frame {frame}"
+        if frame == VECTOR_FRAMES // 2:
+            duels.reset([0, 5])
+            worlds[0].reset()
+            worlds[5].reset()
+
+
+def check_snapshots():
+    rng = random.Random(2)
+    world = DuelWorld(hash_states=True)
+    restored = DuelWorld(hash_states=True)
+    for episode in range(EPISODES * 2):
+        world.reset()
+        while not world.game_over:
+            if rng.random() < 0.05:
+                restored.restore(world.snapshot())
+                assert duel_state(restored) == duel_state(world), f"episode {episode}: restore() lost state"
+                tick = world.tick
+                for _ in range(50):
+                    action = rng.randrange(8)
+                    world.step(action)
+                    restored.step(action)
+                assert duel_state(restored) == duel_state(world), \
+                    f"episode {episode}: play went differently after restore()"
+                assert restored.tick == world.tick and first_desync(world.hash_history[tick:],
+                                                                    restored.hash_history) is None, \
+                    f"episode {episode}: the hash chain went differently after restore()"
+            world.step(rng.randrange(8) if rng.random() < 0.3 else rng.randrange(4))
+
+
+def check_crowd():
+    rng = random.Random(7)
+    for episode in range(EPISODES):
+        world = DuelWorld()
+        crowd = CrowdWorld(1, 1)
+        for frame, action in enumerate(random_actions(rng, rng.randint(50, MAX_FRAMES))):
+            vader_action = None if rng.random() < 0.7 else rng.choice((-1, 0, 1))
+            world.step(action, vader_action)
+            crowd.step([action], None if vader_action is None else [vader_action])
+            crowd_state = (crowd.luke_x[0], crowd.vader_x[0], crowd.vader_direction[0],
+                           crowd.vader_shot_timer[0], crowd.vader_alive[0], crowd.game_over,
+                           sorted(crowd.player_beams), sorted(crowd.vader_beams))
+            assert duel_state(world) == crowd_state, f"CrowdWorld: episode {episode} diverged at frame {frame}"
+            if world.game_over:
+                break
+
+
+def main():
+    checks = [
+        ("DuelWorld vs. original loop (BeamPool)", lambda: check_original_loop(BeamPool)),
+        ("DuelWorld vs. original loop (RectBeamPool)", lambda: check_original_loop(RectBeamPool)),
+        ("advance() vs. step()", check_advance),
+        ("VectorDuel (array) vs. DuelWorld", lambda: check_vector(False)),
+        ("snapshot() / restore()", check_snapshots),
+        ("CrowdWorld 1v1 vs. DuelWorld", check_crowd),
+    ]
+    if np is not None:
+        checks.insert(4, ("VectorDuel (NumPy) vs. DuelWorld", lambda: check_vector(True)))
+    else:
+        print("NumPy not installed, skipping VectorDuel (NumPy)")
+    for name, check in checks:
+        check()
+        print(f"ok  {name}")
+
+
+if __name__ == "__main__":
+    main()
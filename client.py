@@ -0,0 +1,480 @@
+"""The pygame window: menu, game loop and drawing.
+
+Imported by ``game.main()`` only when the game is actually played, so
+importing game.py (or duel.py, env.py, ...) never loads pygame or opens a
+display. Nothing here runs at import time either; ``run()`` initializes
+pygame, the window, fonts and sprites, shows the menu and plays.
+"""
+
+import time
+from collections import namedtuple
+
+import pygame
+
+from assets import LUKE_IMAGE, VADER_IMAGE, AssetRegistry, SpriteCache
+from render import BeamSprite, DirtyRects, TextCache, wrap_text
+from duel import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BEAM_WIDTH, BEAM_HEIGHT,
+    ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE, DuelWorld,
+    FIXED_SHIFT, FIXED_ONE, to_pixels, lerp_fixed,
+)
+
+# The simulation always runs at TICK_RATE; speeds in duel.py are per tick
+TICK_RATE = 60
+TICK_SECONDS = 1 / TICK_RATE
+MAX_TICKS_PER_FRAME = 10 # After a long stall, drop time instead of trying to catch up
+
+# Turbo levels: ticks per rendered frame, None runs as many as fit in UNCAPPED_FRAME_SECONDS
+TURBO_LEVELS = [1, 2, 8, 64, None]
+UNCAPPED_FRAME_SECONDS = 1 / 30
+
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 255, 0)
+GRAY = (150, 150, 150)
+YELLOW = (255, 255, 0) # For menu selection highlight
+DARK_GRAY = (50, 50, 50) # For menu button background
+LIGHT_GRAY = (200, 200, 200) # For description text
+
+# Beam colors
+PLAYER_BEAM_COLOR = BLUE
+DODGER_BEAM_COLOR = RED
+BEAM_GLOW = 3 # Width of the halo around beams with --beam-glow
+
+# Fonts for messages, created by load_fonts()
+Fonts = namedtuple("Fonts", "title menu description win game_over restart hud")
+FONT_SIZES = Fonts(
+    title=90,
+    menu=50,
+    description=28, # Smaller font for descriptions
+    win=74,
+    game_over=74,
+    restart=40,
+    hud=28,
+)
+# The fonts main_menu() needs, created before the rest so the menu shows sooner
+MenuFonts = namedtuple("MenuFonts", "title menu description restart")
+
+# Longest the menu sleeps waiting for input; it has no animations to wake up for
+MENU_WAIT_MS = 1000
+
+# Machine Learning options and their descriptions
+ml_options_data = {
+    "Rule-Based (Constant Movement)": {
+        "description": (
+            "Vader's movement is entirely predictable, following a simple, pre-programmed pattern. "
+            "He will move back and forth at a constant speed, bouncing off the screen edges. "
+            "This mode demonstrates a non-adaptive AI, making it easier to predict and defeat once you learn his pattern."
+        )
+    },
+    "Reinforcement Learning (Q-Learning)": {
+        "description": (
+            "Vader learns to dodge by trial and error. He will explore different movements and "
+            "receive 'rewards' for dodging your beams and 'penalties' for being hit. "
+            "Over time, he aims to optimize his dodging strategy based on past experiences, becoming more challenging as he 'learns'."
+        )
+    },
+    "Genetic Algorithm": {
+        "description": (
+            "Vader's dodging strategy evolves over generations, much like natural selection. "
+            "Multiple 'Vaders' with slightly different dodging behaviors will compete. "
+            "The most successful dodgers 'survive' and 'reproduce', passing on their best traits. "
+            "This process aims to create an increasingly resilient dodging AI over many game rounds."
+        )
+    },
+    "Neural Network (Pre-Trained)": {
+        "description": (
+            "Vader's dodging is controlled by a pre-trained artificial neural network. "
+            "This network has already learned complex dodging patterns from extensive simulated gameplay. "
+            "While not learning in real-time during your game, it demonstrates the power of deep learning "
+            "to create highly effective and intelligent AI behaviors."
+        )
+    },
+    "Simple Heuristic (Predictive)": {
+        "description": (
+            "Vader uses a simple predictive heuristic to anticipate where your beams will land. "
+            "He calculates the beam's trajectory and attempts to move to a safe spot. "
+            "This AI is more intelligent than a purely rule-based one, reacting to threats "
+            "by making calculated movements rather than just following a fixed path."
+        )
+    }
+}
+ml_option_names = list(ml_options_data.keys())
+
+
+def init_display(profile):
+    """Start the display and font subsystems and open the game window; return ``(screen, clock)``.
+
+    Audio and joysticks are never used, so unlike ``pygame.init()`` their
+    subsystems are left alone.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    profile.mark("display, font init")
+    # Screen dimensions come from duel.py
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Dodgeball!")
+    profile.mark("set_mode")
+    return screen, pygame.time.Clock()
+
+
+def load_fonts(fonts_type=Fonts, loaded=None):
+    """Create the fonts named by ``fonts_type`` (``Fonts`` or ``MenuFonts``) at their ``FONT_SIZES``.
+
+    Fonts already in ``loaded`` are reused instead of created again.
+    """
+    have = loaded._asdict() if loaded is not None else {}
+    return fonts_type(*(have[name] if name in have else pygame.font.Font(None, getattr(FONT_SIZES, name))
+                        for name in fonts_type._fields))
+
+
+def load_sprites(cache, params):
+    """Luke's and Vader's images at the sizes in ``params``, or plain stand-ins if they are missing."""
+    luke_size = (to_pixels(params.player_width), to_pixels(params.player_height))
+    vader_size = (to_pixels(params.dodger_width), to_pixels(params.dodger_height))
+    try:
+        return cache.load(LUKE_IMAGE, luke_size), cache.load(VADER_IMAGE, vader_size)
+    except (pygame.error, OSError) as e:
+        print(f"Error loading images: {e}")
+        print("Please ensure 'luke.png' and 'vader.png' are in the same directory.")
+        luke_img = pygame.Surface(luke_size)
+        luke_img.fill(GREEN)
+        vader_img = pygame.Surface(vader_size)
+        vader_img.fill(RED)
+        return luke_img, vader_img
+
+
+def draw_menu(screen, fonts, text, menu_state, selected_option_index):
+    """Draw the menu screen ``menu_state`` with ``selected_option_index`` highlighted."""
+    screen.fill(BLACK)
+
+    if menu_state == 0: # Displaying options
+        # Title
+        title_text, title_rect = text.render(fonts.title, "Star Wars Dodgeball", True, WHITE,
+                                             center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
+        screen.blit(title_text, title_rect)
+
+        # Instructions
+        instruction_text, instruction_rect = text.render(fonts.menu, "Choose Vader's AI:", True, WHITE,
+                                                         center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 120))
+        screen.blit(instruction_text, instruction_rect)
+
+        # Menu options
+        for i, option_name in enumerate(ml_option_names):
+            text_color = YELLOW if i == selected_option_index else WHITE
+            # Calculate position for each option
+            option_text, option_rect = text.render(fonts.menu, option_name, True, text_color,
+                                                   center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60 + i * 60))
+
+            # Draw a background rectangle for the selected option
+            if i == selected_option_index:
+                padding = 20
+                bg_rect = pygame.Rect(option_rect.left - padding, option_rect.top - padding,
+                                      option_rect.width + 2 * padding, option_rect.height + 2 * padding)
+                pygame.draw.rect(screen, DARK_GRAY, bg_rect, border_radius=10) # Rounded corners
+
+            screen.blit(option_text, option_rect)
+
+        # Instruction to press ENTER to view description
+        select_instruction, select_instruction_rect = text.render(
+            fonts.restart, "Press ENTER to View Description", True, WHITE,
+            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
+        screen.blit(select_instruction, select_instruction_rect)
+
+    elif menu_state == 1: # Displaying description
+        current_option_name = ml_option_names[selected_option_index]
+        description = ml_options_data[current_option_name]["description"]
+
+        # Display selected option name
+        selected_title, selected_title_rect = text.render(fonts.menu, current_option_name, True, YELLOW,
+                                                          center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4))
+        screen.blit(selected_title, selected_title_rect)
+
+        # Wrap and display description, laid out and drawn once as a whole paragraph
+        max_width = SCREEN_WIDTH - 100 # 100px padding
+        line_step = fonts.description.get_linesize() + 5 # Move down for next line
+        line_count = len(wrap_text(description, fonts.description, max_width))
+        y_offset = SCREEN_HEIGHT // 2 - (line_count * fonts.description.get_linesize()) // 2 # Center vertically
+        paragraph, paragraph_rect = text.paragraph(fonts.description, description, True, LIGHT_GRAY, max_width,
+                                                   line_step, centerx=SCREEN_WIDTH // 2)
+        # y_offset is where the first line's center goes
+        line_height = paragraph_rect.height - (line_count - 1) * line_step
+        paragraph_rect.top = y_offset - line_height // 2
+        screen.blit(paragraph, paragraph_rect)
+
+        # Add instruction to press ENTER to start
+        start_instruction, start_instruction_rect = text.render(
+            fonts.restart, "Press ENTER to Start Game", True, WHITE,
+            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
+        screen.blit(start_instruction, start_instruction_rect)
+
+
+def main_menu(screen, fonts, text, on_first_frame=None):
+    """Let the player pick Vader's AI; return its name, or None if they quit.
+
+    All labels are drawn through the ``TextCache`` ``text``. The menu sleeps
+    in ``pygame.event.wait()`` and only redraws after a key or window event
+    changed something, so it costs next to no CPU while nobody is playing.
+
+    ``on_first_frame`` is called once the first menu frame is on screen.
+    """
+    selected_option_index = 0 # Index of the currently highlighted option
+
+    # Menu states: 0 = selecting option, 1 = displaying description
+    menu_state = 0
+    redraw = True
+
+    while True:
+        if redraw:
+            draw_menu(screen, fonts, text, menu_state, selected_option_index)
+            pygame.display.flip()
+            redraw = False
+            if on_first_frame is not None:
+                on_first_frame()
+                on_first_frame = None
+
+        # Sleep until there is input, then handle everything that queued up
+        for event in [pygame.event.wait(MENU_WAIT_MS)] + pygame.event.get():
+            if event.type == pygame.QUIT:
+                return None
+            # The window was uncovered: its old contents are gone
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                redraw = True
+            if event.type == pygame.KEYDOWN:
+                if menu_state == 0: # Selecting option
+                    if event.key == pygame.K_UP:
+                        selected_option_index = (selected_option_index - 1) % len(ml_option_names)
+                        redraw = True
+                    elif event.key == pygame.K_DOWN:
+                        selected_option_index = (selected_option_index + 1) % len(ml_option_names)
+                        redraw = True
+                    elif event.key == pygame.K_RETURN: # Select option, move to description state
+                        menu_state = 1
+                        redraw = True
+                elif menu_state == 1: # Displaying description
+                    if event.key == pygame.K_RETURN: # Confirm selection and exit menu
+                        return ml_option_names[selected_option_index]
+
+                if event.key == pygame.K_q: # Quit from any menu state
+                    return None
+
+
+# Luke's movement keys, sampled once per rendered frame
+def read_luke_movement():
+    luke_action = ACTION_NONE
+    keys = pygame.key.get_pressed()
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        luke_action |= ACTION_LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        luke_action |= ACTION_RIGHT
+    return luke_action
+
+
+def play(screen, clock, fonts, text, sprite_cache, sprites, world, scenarios, difficulty_index, fps, turbo_index,
+         full_redraw=False, beam_glow=0):
+    """Run the game loop until the player quits.
+
+    Only the regions that changed are redrawn each frame, unless
+    ``full_redraw`` is set. Beams get a halo ``beam_glow`` pixels wide.
+    """
+    luke_img, vader_img = sprites
+    renderer = DirtyRects(screen, BLACK, full_redraw)
+    player_beam_sprite = BeamSprite(PLAYER_BEAM_COLOR, BEAM_WIDTH, BEAM_HEIGHT, beam_glow)
+    vader_beam_sprite = BeamSprite(DODGER_BEAM_COLOR, BEAM_WIDTH, BEAM_HEIGHT, beam_glow)
+
+    running = True
+    fire_pending = False # SPACE pressed since the last simulation tick
+    accumulator = 0.0 # Real time not yet simulated, in seconds
+    previous_time = time.perf_counter()
+    # Positions before the latest tick, used to interpolate between ticks when drawing
+    prev_luke_x = world.luke_x
+    prev_vader_x = world.vader_x
+    # Effective simulation rate shown on the HUD, refreshed twice a second
+    ticks_simulated = 0
+    tick_rate_start = previous_time
+    tick_rate = 0.0
+
+    # Advance the duel by one fixed tick; every speed setting goes through here
+    def simulate_tick(luke_movement):
+        nonlocal prev_luke_x, prev_vader_x, fire_pending, ticks_simulated
+        prev_luke_x = world.luke_x
+        prev_vader_x = world.vader_x
+        luke_action = (luke_movement | ACTION_FIRE) if fire_pending else luke_movement
+        fire_pending = False
+        ticks_simulated += 1
+        if world.step(luke_action):
+            if world.luke_won:
+                print("Vader hit! You Win!")
+            else:
+                print("Luke hit! Game Over!")
+
+    while running:
+        # Event handling
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            # The window was uncovered: its old contents are gone
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+
+            if event.type == pygame.KEYDOWN:
+                if not world.game_over: # Only allow shooting if game is not over
+                    if event.key == pygame.K_SPACE:
+                        fire_pending = True
+
+                # Check for restart key even if game is over
+                if event.key == pygame.K_r and world.game_over:
+                    world.reset()
+                    prev_luke_x = world.luke_x
+                    prev_vader_x = world.vader_x
+                    accumulator = 0.0
+
+                # Cycle through the difficulty tiers, taking effect on the next tick
+                if event.key == pygame.K_l:
+                    difficulty_index = (difficulty_index + 1) % len(scenarios)
+                    world.params = scenarios[difficulty_index]
+                    luke_img, vader_img = load_sprites(sprite_cache, world.params)
+                    print(f"Difficulty: {scenarios.names[difficulty_index]}")
+
+                # Cycle through the turbo levels
+                if event.key == pygame.K_t:
+                    turbo_index = (turbo_index + 1) % len(TURBO_LEVELS)
+                    accumulator = 0.0
+
+                if event.key == pygame.K_q:
+                    running = False
+
+        now = time.perf_counter()
+        elapsed = now - previous_time
+        previous_time = now
+        turbo = TURBO_LEVELS[turbo_index]
+        luke_movement = read_luke_movement()
+
+        # Game logic update (only if game is not over)
+        if turbo == 1:
+            # Real time: run every fixed tick that is due
+            accumulator += min(elapsed, MAX_TICKS_PER_FRAME * TICK_SECONDS)
+            while accumulator >= TICK_SECONDS and not world.game_over:
+                accumulator -= TICK_SECONDS
+                simulate_tick(luke_movement)
+        elif turbo is None:
+            # Uncapped: simulate until this frame's time slice is used up
+            deadline = now + UNCAPPED_FRAME_SECONDS
+            while not world.game_over:
+                simulate_tick(luke_movement)
+                if ticks_simulated % 64 == 0 and time.perf_counter() >= deadline:
+                    break
+        else:
+            for _ in range(turbo):
+                if world.game_over:
+                    break
+                simulate_tick(luke_movement)
+
+        if now - tick_rate_start >= 0.5:
+            tick_rate = ticks_simulated / (now - tick_rate_start)
+            ticks_simulated = 0
+            tick_rate_start = now
+
+        # Fraction of a tick elapsed since the latest state, in 1/FIXED_ONE steps; a finished duel is drawn as is
+        alpha = FIXED_ONE if world.game_over or turbo != 1 else int(accumulator / TICK_SECONDS * FIXED_ONE)
+        beam_lag = FIXED_ONE - alpha
+
+        # Drawing
+        renderer.begin()
+
+        # Draw Luke
+        luke_x = to_pixels(lerp_fixed(prev_luke_x, world.luke_x, alpha))
+        renderer.blit(luke_img, (luke_x, to_pixels(world.luke_y)))
+
+        # Draw Vader only if alive
+        if world.vader_alive:
+            vader_x = to_pixels(lerp_fixed(prev_vader_x, world.vader_x, alpha))
+            renderer.blit(vader_img, (vader_x, to_pixels(world.vader_y)))
+        else:
+            # Display "You Win!" message
+            win_text, text_rect_win = text.render(fonts.win, "You Win!", True, GREEN,
+                                                  center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
+            renderer.blit(win_text, text_rect_win)
+
+            # Display "Press R to Restart" message
+            restart_text, text_rect_restart = text.render(fonts.restart, "Press R to Restart", True, WHITE,
+                                                          center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
+            renderer.blit(restart_text, text_rect_restart)
+
+        # Display "Game Over!" message if Luke is hit
+        if world.game_over and not world.vader_alive:
+            pass # Already handled above (You Win!)
+        elif world.game_over and world.vader_alive:
+            game_over_text, text_rect_game_over = text.render(fonts.game_over, "Game Over!", True, GRAY,
+                                                              center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30))
+            renderer.blit(game_over_text, text_rect_game_over)
+
+            restart_text, text_rect_restart = text.render(fonts.restart, "Press R to Restart", True, WHITE,
+                                                          center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
+            renderer.blit(restart_text, text_rect_restart)
+
+        # Draw Luke's beams, all in one blit call
+        player_beam_lag = world.params.player_beam_speed * beam_lag >> FIXED_SHIFT
+        renderer.blits(player_beam_sprite.surface, player_beam_sprite.dests(world.player_beams, player_beam_lag))
+
+        # Draw Vader's beams, all in one blit call
+        vader_beam_lag = world.params.dodger_beam_speed * beam_lag >> FIXED_SHIFT
+        renderer.blits(vader_beam_sprite.surface, vader_beam_sprite.dests(world.vader_beams, vader_beam_lag))
+
+        # Turbo HUD with the effective simulation rate
+        if turbo != 1:
+            label = "uncapped" if turbo is None else f"x{turbo}"
+            hud_text, _ = text.render(fonts.hud, f"Turbo {label}: {tick_rate:,.0f} ticks/s", True, YELLOW)
+            renderer.blit(hud_text, (10, 10))
+
+        renderer.present()
+        # Turbo frames are not throttled
+        clock.tick(fps if turbo == 1 else 0)
+
+
+def run(args, scenarios, difficulty_index, profile):
+    """Open the window, show the menu and play until the player quits.
+
+    Startup phases are marked on ``profile`` (a ``game.StartupProfile``),
+    which is printed after the first menu frame with ``--startup-profile``.
+    """
+    loader = None
+    try:
+        screen, clock = init_display(profile)
+        # Game state lives in a headless DuelWorld
+        world = DuelWorld(scenarios.player_beam_capacity, scenarios.vader_beam_capacity, seed=args.seed,
+                          params=scenarios[difficulty_index])
+        # Sprites load on another thread while the player is in the menu
+        sprite_cache = SpriteCache()
+        assets = AssetRegistry()
+        loader = assets.load_in_background({"sprites": lambda: load_sprites(sprite_cache, world.params)})
+        menu_fonts = load_fonts(MenuFonts)
+        profile.mark("menu fonts")
+
+        def first_menu_frame():
+            profile.mark("menu first render")
+            if args.startup_profile:
+                profile.report()
+
+        text = TextCache()
+        selected_ml_type = main_menu(screen, menu_fonts, text, first_menu_frame)
+        if selected_ml_type is None:
+            return
+        print(f"Selected ML type for Vader: {selected_ml_type}")
+        fonts = load_fonts(Fonts, menu_fonts)
+        sprites = assets.get("sprites") # Waits only if the player got through the menu first
+        if args.startup_profile:
+            cached = " (cached)" if not sprite_cache.misses else ""
+            print(f"Sprites loaded in the background in {assets.load_seconds['sprites'] * 1000:.1f} ms{cached}; "
+                  f"the game waited {assets.wait_seconds * 1000:.1f} ms for them")
+        turbo_index = TURBO_LEVELS.index(None if args.turbo == "uncapped" else int(args.turbo))
+        play(screen, clock, fonts, text, sprite_cache, sprites, world, scenarios, difficulty_index,
+             args.fps, turbo_index, args.full_redraw, BEAM_GLOW if args.beam_glow else 0)
+    finally:
+        if loader is not None:
+            loader.join() # Don't pull the display out from under a sprite being converted
+        pygame.quit()
@@ -0,0 +1,197 @@
+"""Many Vaders against many Lukes in one headless world.
+
+``CrowdWorld`` runs the rules of ``duel.DuelWorld`` for a row of Vaders and
+a row of Lukes at once, for stress-testing dodging strategies under
+crowding. Every entity has its own position, and every Vader his own
+direction and shot timer; a side's beams share one ``BeamPool`` bucketed by
+column, so each entity's hit test only looks at the beams above or below it
+instead of every beam on screen.
+"""
+
+import random
+
+from beams import BeamPool, ColumnBuckets
+from duel import (
+    VADER_SHOT_INTERVAL, PLAYER_BEAM_CAPACITY, VADER_BEAM_CAPACITY,
+    SCREEN_WIDTH_FX, SCREEN_HEIGHT_FX, BEAM_WIDTH_FX, BEAM_HEIGHT_FX,
+    PLAYER_BEAM_SPEED_FX, DODGER_BEAM_SPEED_FX,
+    PLAYER_WIDTH_FX, PLAYER_HEIGHT_FX, PLAYER_SPEED_FX, initial_luke_y_fx,
+    DODGER_WIDTH_FX, DODGER_HEIGHT_FX, DODGER_SPEED_FX, initial_vader_y_fx,
+    PLAYER_BEAM_OFFSET_FX, VADER_BEAM_OFFSET_FX,
+    ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE, to_fixed,
+)
+
+# Width of a beam bucket column
+COLUMN_WIDTH_FX = to_fixed(32)
+
+LUKE_FIRE_CHANCE = 0.05 # Per frame, for the scripted Lukes
+
+
+def _spread(count, width):
+    """Left edges that spread ``count`` sprites of ``width`` evenly across the screen."""
+    room = SCREEN_WIDTH_FX - width
+    if count == 1:
+        return [room // 2]
+    return [room * i // (count - 1) for i in range(count)]
+
+
+def chasing_lukes(world, fire_chance=LUKE_FIRE_CHANCE):
+    """Scripted Lukes: Luke ``j`` walks under Vader ``j % num_vaders`` and fires at random (from ``world.rng``)."""
+    actions = []
+    vader_x, num_vaders = world.vader_x, world.num_vaders
+    rng = world.rng
+    for j, luke_x in enumerate(world.luke_x):
+        luke_action = ACTION_NONE
+        offset = (vader_x[j % num_vaders] + DODGER_WIDTH_FX // 2) - (luke_x + PLAYER_WIDTH_FX // 2)
+        if offset < -PLAYER_SPEED_FX:
+            luke_action |= ACTION_LEFT
+        elif offset > PLAYER_SPEED_FX:
+            luke_action |= ACTION_RIGHT
+        if rng.random() < fire_chance:
+            luke_action |= ACTION_FIRE
+        actions.append(luke_action)
+    return actions
+
+
+class CrowdWorld:
+    """``num_vaders`` Vaders against ``num_lukes`` Lukes, advanced one frame per ``step()`` call.
+
+    Per-entity state is kept in parallel lists: ``luke_x``, ``luke_y``,
+    ``luke_alive`` for the Lukes and ``vader_x``, ``vader_y``,
+    ``vader_direction``, ``vader_shot_timer``, ``vader_alive`` for the
+    Vaders, all positions in ``duel``'s simulation units. The entities
+    start spread evenly along their rows. A beam that hits removes the
+    entity it hits; the game is over once a whole side is gone.
+
+    With one Vader and one Luke this plays exactly like ``DuelWorld``.
+    """
+
+    def __init__(self, num_vaders, num_lukes, seed=None):
+        self.num_vaders = num_vaders
+        self.num_lukes = num_lukes
+        self.player_beams = BeamPool(num_lukes * PLAYER_BEAM_CAPACITY, BEAM_WIDTH_FX, BEAM_HEIGHT_FX,
+                                     ColumnBuckets(SCREEN_WIDTH_FX, COLUMN_WIDTH_FX, BEAM_WIDTH_FX))
+        self.vader_beams = BeamPool(num_vaders * VADER_BEAM_CAPACITY, BEAM_WIDTH_FX, BEAM_HEIGHT_FX,
+                                    ColumnBuckets(SCREEN_WIDTH_FX, COLUMN_WIDTH_FX, BEAM_WIDTH_FX))
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Put every entity back into its starting state.
+
+        Passing ``seed`` also reseeds ``rng``; otherwise the stream carries on.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.tick = 0
+        self.luke_x = _spread(self.num_lukes, PLAYER_WIDTH_FX)
+        self.luke_y = [initial_luke_y_fx] * self.num_lukes
+        self.luke_alive = [True] * self.num_lukes
+        self.vader_x = _spread(self.num_vaders, DODGER_WIDTH_FX)
+        self.vader_y = [initial_vader_y_fx] * self.num_vaders
+        self.vader_direction = [1] * self.num_vaders # 1 for right, -1 for left
+        self.vader_shot_timer = [0] * self.num_vaders
+        self.vader_alive = [True] * self.num_vaders
+        self.lukes_left = self.num_lukes
+        self.vaders_left = self.num_vaders
+        self.player_beams.clear()
+        self.vader_beams.clear()
+        self.game_over = False
+
+    def step(self, luke_actions, vader_actions=None):
+        """Advance every entity by one frame and return ``game_over``.
+
+        ``luke_actions`` holds one ``ACTION_*`` bitmask per Luke.
+        ``vader_actions`` is None for the rule-based bounce, or holds one
+        -1/0/1 per Vader. The update order is ``DuelWorld.step()``'s, with
+        each phase run for the whole side at once.
+        """
+        if self.game_over:
+            return True
+
+        # Lukes fire and move
+        luke_xs, luke_ys, luke_alive = self.luke_x, self.luke_y, self.luke_alive
+        spawn = self.player_beams.spawn
+        for j in range(self.num_lukes):
+            if not luke_alive[j]:
+                continue
+            action = luke_actions[j]
+            luke_x = luke_xs[j]
+            if action & ACTION_FIRE:
+                spawn(luke_x + PLAYER_BEAM_OFFSET_FX, luke_ys[j])
+            if action & ACTION_LEFT:
+                luke_x -= PLAYER_SPEED_FX
+            if action & ACTION_RIGHT:
+                luke_x += PLAYER_SPEED_FX
+            if luke_x < 0:
+                luke_x = 0
+            if luke_x + PLAYER_WIDTH_FX > SCREEN_WIDTH_FX:
+                luke_x = SCREEN_WIDTH_FX - PLAYER_WIDTH_FX
+            luke_xs[j] = luke_x
+
+        # Vaders move, bounce and shoot
+        vader_xs, vader_ys, vader_alive = self.vader_x, self.vader_y, self.vader_alive
+        directions, timers = self.vader_direction, self.vader_shot_timer
+        spawn = self.vader_beams.spawn
+        for i in range(self.num_vaders):
+            if not vader_alive[i]:
+                continue
+            if vader_actions is not None:
+                directions[i] = vader_actions[i]
+            vader_x = vader_xs[i] + DODGER_SPEED_FX * directions[i]
+            if vader_x < 0:
+                vader_x = 0
+                directions[i] = 1
+            elif vader_x + DODGER_WIDTH_FX > SCREEN_WIDTH_FX:
+                vader_x = SCREEN_WIDTH_FX - DODGER_WIDTH_FX
+                directions[i] = -1
+            vader_xs[i] = vader_x
+            timers[i] += 1
+            if timers[i] >= VADER_SHOT_INTERVAL:
+                timers[i] = 0
+                spawn(vader_x + VADER_BEAM_OFFSET_FX, vader_ys[i] + DODGER_HEIGHT_FX)
+
+        # Luke's beams fly up, then each Vader checks the beams in his columns.
+        # Beams leaving the screen are dropped first, which can't change a hit
+        # as long as the targets are on screen.
+        beams = self.player_beams
+        if beams.count:
+            beams.move(PLAYER_BEAM_SPEED_FX, 0, SCREEN_HEIGHT_FX)
+            self.vaders_left -= _hit_targets(beams, vader_xs, vader_ys, vader_alive, DODGER_WIDTH_FX, DODGER_HEIGHT_FX)
+
+        # Vader's beams fly down, then each Luke checks the beams in his columns
+        beams = self.vader_beams
+        if beams.count:
+            beams.move(DODGER_BEAM_SPEED_FX, 0, SCREEN_HEIGHT_FX)
+            self.lukes_left -= _hit_targets(beams, luke_xs, luke_ys, luke_alive, PLAYER_WIDTH_FX, PLAYER_HEIGHT_FX)
+
+        self.tick += 1
+        self.game_over = not self.vaders_left or not self.lukes_left
+        return self.game_over
+
+
+def _hit_targets(beams, xs, ys, alive, width, height):
+    """Remove every live target in ``xs``/``ys`` that a beam overlaps; return how many were hit.
+
+    Like ``BeamPool.advance()``, every beam overlapping a target is used up
+    by it, so a beam can't hit two targets on the same frame.
+    """
+    beam_xs, beam_ys = beams.x, beams.y
+    beam_width, beam_height = beams.width, beams.height
+    hits = 0
+    for i, x in enumerate(xs):
+        if not alive[i]:
+            continue
+        top = ys[i]
+        bottom = top + height
+        right = x + width
+        # Collected first: near() walks the buckets that kill() changes
+        overlapping = [slot for slot in beams.near(x, right)
+                       if beam_xs[slot] < right and beam_xs[slot] + beam_width > x
+                       and beam_ys[slot] < bottom and beam_ys[slot] + beam_height > top]
+        if overlapping:
+            for slot in overlapping:
+                beams.kill(slot)
+            alive[i] = False
+            hits += 1
+    return hits
@@ -0,0 +1,499 @@
+"""Display-free simulation of the Luke vs. Vader duel.
+
+This module holds the game rules that used to live in the ``while running:``
+loop of game.py. It has no pygame dependency, so it can be imported by
+training scripts, benchmarks and worker processes without opening a window,
+and stepped as fast as the CPU allows instead of at 60 FPS.
+
+Rectangles are plain integers (top-left x/y plus the fixed sizes below) and
+overlap is tested with the same rule as ``pygame.Rect.colliderect``.
+
+Positions and speeds are fixed-point integers in 1/256 of a pixel (the
+``*_FX`` constants), never floats, so every process that runs the same
+duel computes the same bits. Rounding only happens at the edges:
+``to_fixed()`` turns a pixel value into simulation units and ``to_pixels()``
+turns a position back into a pixel to draw at, both rounding half up, and
+``lerp_fixed()`` interpolates between ticks in integers for the renderer.
+"""
+
+import math
+import random
+import struct
+from array import array
+from collections import namedtuple
+from zlib import crc32
+
+from beams import BeamPool
+
+# Screen dimensions
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 640
+
+# Beam properties
+BEAM_WIDTH = 5
+BEAM_HEIGHT = 20
+
+# Luke's beam properties
+PLAYER_BEAM_SPEED = -10
+
+# Vader's beam properties
+DODGER_BEAM_SPEED = 7
+VADER_SHOT_INTERVAL = 60 # Frames between Vader's shots
+
+# Player (Luke) properties
+PLAYER_WIDTH = 100
+PLAYER_HEIGHT = 100
+PLAYER_SPEED = 7
+initial_luke_x = (SCREEN_WIDTH - PLAYER_WIDTH) // 2
+initial_luke_y = 500
+
+# Dodger (Vader) properties
+DODGER_WIDTH = 100
+DODGER_HEIGHT = 100
+DODGER_SPEED = 4
+initial_vader_x = (SCREEN_WIDTH - DODGER_WIDTH) // 2
+initial_vader_y = 40
+
+# Fixed-point scale: simulation units per pixel
+FIXED_SHIFT = 8
+FIXED_ONE = 1 << FIXED_SHIFT
+
+
+def to_fixed(pixels):
+    """Convert a pixel value (int or float) to simulation units, rounding half up."""
+    if isinstance(pixels, int):
+        return pixels << FIXED_SHIFT
+    return math.floor(pixels * FIXED_ONE + 0.5)
+
+
+def to_pixels(fixed):
+    """Convert simulation units to the nearest whole pixel, rounding half up."""
+    return (fixed + (FIXED_ONE >> 1)) >> FIXED_SHIFT
+
+
+def lerp_fixed(start, end, weight):
+    """Blend two positions, ``weight`` running from 0 (``start``) to ``FIXED_ONE`` (``end``), rounding down."""
+    return start + ((end - start) * weight >> FIXED_SHIFT)
+
+
+# The properties above in simulation units
+SCREEN_WIDTH_FX = to_fixed(SCREEN_WIDTH)
+SCREEN_HEIGHT_FX = to_fixed(SCREEN_HEIGHT)
+BEAM_WIDTH_FX = to_fixed(BEAM_WIDTH)
+BEAM_HEIGHT_FX = to_fixed(BEAM_HEIGHT)
+PLAYER_BEAM_SPEED_FX = to_fixed(PLAYER_BEAM_SPEED)
+DODGER_BEAM_SPEED_FX = to_fixed(DODGER_BEAM_SPEED)
+PLAYER_WIDTH_FX = to_fixed(PLAYER_WIDTH)
+PLAYER_HEIGHT_FX = to_fixed(PLAYER_HEIGHT)
+PLAYER_SPEED_FX = to_fixed(PLAYER_SPEED)
+DODGER_WIDTH_FX = to_fixed(DODGER_WIDTH)
+DODGER_HEIGHT_FX = to_fixed(DODGER_HEIGHT)
+DODGER_SPEED_FX = to_fixed(DODGER_SPEED)
+initial_luke_x_fx = to_fixed(initial_luke_x)
+initial_luke_y_fx = to_fixed(initial_luke_y)
+initial_vader_x_fx = to_fixed(initial_vader_x)
+initial_vader_y_fx = to_fixed(initial_vader_y)
+# Where beams spawn relative to the shooter's left edge (whole pixels, as in the original game)
+PLAYER_BEAM_OFFSET_FX = to_fixed(PLAYER_WIDTH // 2 - BEAM_WIDTH // 2)
+VADER_BEAM_OFFSET_FX = to_fixed(DODGER_WIDTH // 2 - BEAM_WIDTH // 2)
+
+# Beam pool sizes: enough for Luke firing every frame, so no shot is dropped
+PLAYER_BEAM_CAPACITY = initial_luke_y_fx // -PLAYER_BEAM_SPEED_FX + 2
+VADER_BEAM_CAPACITY = ((SCREEN_HEIGHT_FX - initial_vader_y_fx - DODGER_HEIGHT_FX) // DODGER_BEAM_SPEED_FX
+                       // VADER_SHOT_INTERVAL + 2)
+
+# One difficulty setting, compiled by make_params() into simulation units.
+# DuelWorld reads the whole tuple at once per step, so swapping it is free.
+DuelParams = namedtuple("DuelParams", [
+    "player_speed", "player_width", "player_height", "player_beam_speed", "player_beam_offset",
+    "luke_start_x", "luke_y",
+    "dodger_speed", "dodger_width", "dodger_height", "dodger_beam_speed", "vader_beam_offset",
+    "vader_shot_interval", "vader_start_x", "vader_y",
+    "player_beam_capacity", "vader_beam_capacity",
+])
+
+# The tunables make_params() accepts, in pixels and frames
+TUNABLES = (
+    "player_speed", "player_width", "player_height", "player_beam_speed",
+    "dodger_speed", "dodger_width", "dodger_height", "dodger_beam_speed", "vader_shot_interval",
+)
+
+
+def make_params(player_speed=PLAYER_SPEED, player_width=PLAYER_WIDTH, player_height=PLAYER_HEIGHT,
+                player_beam_speed=PLAYER_BEAM_SPEED,
+                dodger_speed=DODGER_SPEED, dodger_width=DODGER_WIDTH, dodger_height=DODGER_HEIGHT,
+                dodger_beam_speed=DODGER_BEAM_SPEED, vader_shot_interval=VADER_SHOT_INTERVAL):
+    """Check a set of tunables (pixels per frame, pixels, frames) and compile it into ``DuelParams``.
+
+    Speeds and sizes may be fractional; beams keep their fixed size. Raises
+    ``ValueError`` for a value the rules can't play with.
+    """
+    if player_speed < 0 or dodger_speed < 0:
+        raise ValueError("player_speed and dodger_speed can't be negative")
+    if player_beam_speed >= 0:
+        raise ValueError("player_beam_speed must be negative (Luke's beams fly up)")
+    if dodger_beam_speed <= 0:
+        raise ValueError("dodger_beam_speed must be positive (Vader's beams fly down)")
+    if not isinstance(vader_shot_interval, int) or vader_shot_interval < 1:
+        raise ValueError("vader_shot_interval must be a whole number of frames, at least 1")
+    # Checked in simulation units, where a fractional size may round to a limit.
+    # A sprite as wide as the screen would have no room to move.
+    for name, size, limit in (("player_width", player_width, SCREEN_WIDTH),
+                              ("dodger_width", dodger_width, SCREEN_WIDTH)):
+        if not 0 < to_fixed(size) < to_fixed(limit):
+            raise ValueError(f"{name} must be above 0 and below {limit}")
+    for name, size, limit in (("player_height", player_height, SCREEN_HEIGHT - initial_luke_y),
+                              ("dodger_height", dodger_height, initial_luke_y - initial_vader_y)):
+        if not 0 < to_fixed(size) <= to_fixed(limit):
+            raise ValueError(f"{name} must be above 0 and at most {limit}")
+
+    luke_y = to_fixed(initial_luke_y)
+    vader_y = to_fixed(initial_vader_y)
+    player_beam_speed = to_fixed(player_beam_speed)
+    dodger_beam_speed = to_fixed(dodger_beam_speed)
+    dodger_height_fx = to_fixed(dodger_height)
+    if player_beam_speed >= 0 or dodger_beam_speed <= 0:
+        raise ValueError("beam speeds must be at least 1/256 px per frame")
+    return DuelParams(
+        to_fixed(player_speed), to_fixed(player_width), to_fixed(player_height), player_beam_speed,
+        to_fixed(player_width // 2 - BEAM_WIDTH // 2), to_fixed((SCREEN_WIDTH - player_width) // 2), luke_y,
+        to_fixed(dodger_speed), to_fixed(dodger_width), dodger_height_fx, dodger_beam_speed,
+        to_fixed(dodger_width // 2 - BEAM_WIDTH // 2), vader_shot_interval,
+        to_fixed((SCREEN_WIDTH - dodger_width) // 2), vader_y,
+        luke_y // -player_beam_speed + 2,
+        (SCREEN_HEIGHT_FX - vader_y - dodger_height_fx) // dodger_beam_speed // vader_shot_interval + 2,
+    )
+
+
+# The original game's settings
+DEFAULT_PARAMS = make_params()
+
+# Luke's actions, combined as a bitmask (e.g. ACTION_LEFT | ACTION_FIRE)
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_FIRE = 4
+
+# Upper bound on frames to look ahead when nothing else limits an advance() jump
+_NEVER = 1 << 60
+
+# Snapshot layout: luke_x, vader_x, vader_direction, vader_shot_timer,
+# vader_alive, game_over, tick, state_hash, player beam count, Vader beam
+# count, then the (x, y) corners of Luke's beams followed by Vader's. The
+# timer and counts are full-width ints, so any shot interval or pool
+# capacity packs.
+_SNAPSHOT_HEADER = '<iibi??QIII'
+_SNAPSHOT_HEADER_SIZE = struct.calcsize(_SNAPSHOT_HEADER)
+_SNAPSHOT_COUNTS = struct.Struct('<II') # The two beam counts ending the header
+_SNAPSHOT_COUNTS_OFFSET = _SNAPSHOT_HEADER_SIZE - _SNAPSHOT_COUNTS.size
+_snapshot_structs = {}
+
+
+def _snapshot_struct(beam_count):
+    """Return the (cached) struct for a snapshot holding ``beam_count`` beams."""
+    layout = _snapshot_structs.get(beam_count)
+    if layout is None:
+        layout = _snapshot_structs[beam_count] = struct.Struct(f'{_SNAPSHOT_HEADER}{2 * beam_count}i')
+    return layout
+
+
+def first_desync(hashes, other_hashes):
+    """Return the first tick (0-based) where two ``hash_history`` records differ, or None.
+
+    A run that is a prefix of the other counts as matching.
+    """
+    for tick, (a, b) in enumerate(zip(hashes, other_hashes)):
+        if a != b:
+            return tick
+    return None
+
+
+def _frames_below(p, v, q):
+    """Return the (first, last) frames f >= 1 where ``p + v * f < q``.
+
+    ``last`` is ``_NEVER`` for an open-ended range; ``first > last`` means
+    never.
+    """
+    if v > 0:
+        return 1, (q - p - 1) // v
+    if v < 0:
+        return max(1, (p - q) // -v + 1), _NEVER
+    return (1, _NEVER) if p < q else (1, 0)
+
+
+def _first_overlap_frame(a_x, a_vx, a_y, a_vy, a_w, a_h, b_x, b_vx, b_y, b_vy, b_w, b_h):
+    """Return the first frame f >= 1 where two linearly moving rects overlap.
+
+    Rect A is at ``(a_x + a_vx * f, a_y + a_vy * f)`` on frame f, likewise B.
+    Overlap uses the ``colliderect`` rule. Returns ``_NEVER`` if they don't.
+    """
+    first, last = 1, _NEVER
+    for p, v, q in ((a_x - b_x - b_w, a_vx - b_vx, 0), # A.left < B.right
+                    (b_x - a_x - a_w, b_vx - a_vx, 0), # B.left < A.right
+                    (a_y - b_y - b_h, a_vy - b_vy, 0), # A.top < B.bottom
+                    (b_y - a_y - a_h, b_vy - a_vy, 0)): # B.top < A.bottom
+        lo, hi = _frames_below(p, v, q)
+        if lo > first:
+            first = lo
+        if hi < last:
+            last = hi
+        if first > last:
+            return _NEVER
+    return first
+
+
+class DuelWorld:
+    """One Luke vs. Vader duel, advanced one frame per ``step()`` call.
+
+    The public attributes mirror the globals game.py used to keep:
+    ``luke_x``/``vader_x`` are the left edges of the sprites, and
+    ``player_beams``/``vader_beams`` are pools of beam corners, all in
+    simulation units (``to_pixels()`` gives the pixel to draw at).
+    ``beam_pool`` picks the pool class: ``BeamPool`` (pure Python) or
+    ``beams.RectBeamPool`` (pygame-ce bulk collisions, faster with many beams).
+
+    ``params`` (a ``DuelParams`` from ``make_params()`` or one tier of a
+    ``scenarios.ScenarioTable``) holds the speeds, sizes and shot interval.
+    It can be swapped for another at any time, taking effect on the next
+    frame; the beam pools are sized for ``params`` unless capacities are
+    given, so size them for the most demanding setting when switching.
+
+    ``rng`` is the duel's only source of randomness; any AI decision that
+    needs chance must draw from it, so a duel is replayed exactly from its
+    ``seed`` and Luke's actions. With ``hash_states`` on, ``state_hash`` is a
+    rolling CRC-32 of the state after every tick and ``hash_history`` keeps
+    one per tick, so ``first_desync()`` can point at the tick where two runs
+    parted ways.
+    """
+
+    def __init__(self, player_beam_capacity=None, vader_beam_capacity=None,
+                 beam_pool=BeamPool, seed=None, hash_states=False, params=DEFAULT_PARAMS):
+        self.params = params
+        if player_beam_capacity is None:
+            player_beam_capacity = params.player_beam_capacity
+        if vader_beam_capacity is None:
+            vader_beam_capacity = params.vader_beam_capacity
+        self.player_beams = beam_pool(player_beam_capacity, BEAM_WIDTH_FX, BEAM_HEIGHT_FX)
+        self.vader_beams = beam_pool(vader_beam_capacity, BEAM_WIDTH_FX, BEAM_HEIGHT_FX)
+        self.rng = random.Random(seed)
+        self.hash_history = array('L') if hash_states else None
+        self.reset()
+
+    def reset(self, seed=None):
+        """Put the duel back into its starting state (same as restart_game).
+
+        Passing ``seed`` also reseeds ``rng``; otherwise the stream carries on.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.tick = 0
+        self.state_hash = 0
+        if self.hash_history is not None:
+            del self.hash_history[:]
+        params = self.params
+        self.luke_x = params.luke_start_x
+        self.luke_y = params.luke_y
+        self.vader_x = params.vader_start_x
+        self.vader_y = params.vader_y
+        self.vader_direction = 1 # 1 for right, -1 for left
+        self.vader_shot_timer = 0
+        self.player_beams.clear()
+        self.vader_beams.clear()
+        self.vader_alive = True
+        self.game_over = False
+
+    @property
+    def luke_won(self):
+        return self.game_over and not self.vader_alive
+
+    def snapshot(self):
+        """Return the duel state packed into a small ``bytes`` record for ``restore()``.
+
+        A record is 35 bytes plus 8 per beam in flight. With 8 beams that is
+        roughly 2 us per ``snapshot()`` and 3 us per ``restore()`` in CPython,
+        a few hundred of each per millisecond: most of it is gathering the
+        corners out of the pools, one Python iteration per beam.
+        """
+        player_beams, vader_beams = self.player_beams, self.vader_beams
+        beam_count = player_beams.count + vader_beams.count
+        layout = _snapshot_structs.get(beam_count) or _snapshot_struct(beam_count)
+        return layout.pack(
+            self.luke_x, self.vader_x, self.vader_direction, self.vader_shot_timer,
+            self.vader_alive, self.game_over, self.tick, self.state_hash, player_beams.count, vader_beams.count,
+            *player_beams.corners(), *vader_beams.corners())
+
+    def restore(self, snapshot):
+        """Put the duel back into the state recorded by ``snapshot()``.
+
+        ``tick`` and ``state_hash`` are restored too, so the hash chain goes
+        on from the snapshot's tick. ``hash_history`` restarts empty:
+        ``hash_history[i]`` is then tick ``tick + i + 1`` of the run the
+        snapshot came from, e.g. ``first_desync(original.hash_history[tick:],
+        replay.hash_history)`` compares a replay from the snapshot.
+        """
+        player_count, vader_count = _SNAPSHOT_COUNTS.unpack_from(snapshot, _SNAPSHOT_COUNTS_OFFSET)
+        layout = _snapshot_structs.get(player_count + vader_count) or _snapshot_struct(player_count + vader_count)
+        values = layout.unpack(snapshot)
+        (self.luke_x, self.vader_x, self.vader_direction, self.vader_shot_timer,
+         self.vader_alive, self.game_over, self.tick, self.state_hash) = values[:8]
+        if self.hash_history is not None:
+            del self.hash_history[:]
+        self.player_beams.load_corners(values, 10, player_count)
+        self.vader_beams.load_corners(values, 10 + 2 * player_count, vader_count)
+
+    def step(self, luke_action=ACTION_NONE, vader_action=None):
+        """Advance the duel by one frame and return ``game_over``.
+
+        ``luke_action`` is a bitmask of ``ACTION_*`` flags. ``vader_action``
+        is None for the rule-based bounce, or -1/0/1 to move Vader left,
+        keep him still or move him right this frame. The order of the
+        update is the same as the original game loop: Luke fires, Luke moves,
+        Vader moves and shoots, then Luke's and Vader's beams advance and are
+        checked for hits.
+        """
+        if self.game_over:
+            return True
+
+        # One unpack per frame instead of an attribute lookup per use
+        (player_speed, player_width, player_height, player_beam_speed, player_beam_offset, _, _,
+         dodger_speed, dodger_width, dodger_height, dodger_beam_speed, vader_beam_offset,
+         vader_shot_interval, _, _, _, _) = self.params
+        luke_x = self.luke_x
+        if luke_action & ACTION_FIRE:
+            # Beam starts from Luke's center top
+            self.player_beams.spawn(luke_x + player_beam_offset, self.luke_y)
+
+        # Luke's horizontal movement
+        if luke_action & ACTION_LEFT:
+            luke_x -= player_speed
+        if luke_action & ACTION_RIGHT:
+            luke_x += player_speed
+
+        # Keep Luke within screen bounds
+        if luke_x < 0:
+            luke_x = 0
+        if luke_x + player_width > SCREEN_WIDTH_FX:
+            luke_x = SCREEN_WIDTH_FX - player_width
+        self.luke_x = luke_x
+
+        # Vader's horizontal movement (currently constant, will be replaced by ML)
+        vader_x = self.vader_x
+        if self.vader_alive:
+            if vader_action is not None:
+                self.vader_direction = vader_action
+            vader_x += dodger_speed * self.vader_direction
+
+            # Reverse direction if Vader hits screen edges
+            if vader_x < 0:
+                vader_x = 0
+                self.vader_direction = 1
+            elif vader_x + dodger_width > SCREEN_WIDTH_FX:
+                vader_x = SCREEN_WIDTH_FX - dodger_width
+                self.vader_direction = -1
+            self.vader_x = vader_x
+
+            # Vader's shooting logic
+            self.vader_shot_timer += 1
+            if self.vader_shot_timer >= vader_shot_interval:
+                self.vader_shot_timer = 0
+                self.vader_beams.spawn(vader_x + vader_beam_offset, self.vader_y + dodger_height)
+
+        # Luke's beams fly up; one that hits Vader ends the duel
+        if self.player_beams.count and self.player_beams.advance(
+                player_beam_speed, (vader_x, self.vader_y, dodger_width, dodger_height), 0, SCREEN_HEIGHT_FX):
+            self.vader_alive = False
+            self.game_over = True
+
+        # Vader's beams fly down; one that hits Luke ends the duel
+        if self.vader_beams.count and self.vader_beams.advance(
+                dodger_beam_speed, (luke_x, self.luke_y, player_width, player_height), 0, SCREEN_HEIGHT_FX):
+            self.game_over = True
+
+        self.tick += 1
+        if self.hash_history is not None:
+            self.state_hash = crc32(self.snapshot(), self.state_hash)
+            self.hash_history.append(self.state_hash)
+        return self.game_over
+
+    def advance(self, frames, luke_action=ACTION_NONE):
+        """Advance up to ``frames`` frames with Luke holding ``luke_action`` and Vader on rule-based movement.
+
+        Gives the same result as calling ``step(luke_action)`` that many
+        times, but jumps straight to the frame before the next event (a wall
+        bounce, Vader's shot, Luke reaching a wall, a beam hitting someone or
+        leaving the screen) and only runs ``step()`` for the event frame
+        itself. Stops early when the duel ends. Returns the number of frames
+        advanced.
+
+        Holding ``ACTION_FIRE`` fires on every frame, so every frame is an
+        event and nothing is skipped. With ``hash_states`` on nothing is
+        skipped either, so every tick gets its hash.
+        """
+        done = 0
+        while done < frames and not self.game_over:
+            if self.hash_history is not None:
+                skip = 0
+            else:
+                skip = self._frames_to_next_event(luke_action, frames - done) - 1
+            if skip > 0:
+                self._drift(skip, luke_action)
+            self.step(luke_action)
+            done += skip + 1
+        return done
+
+    def _luke_velocity(self, luke_action):
+        """Luke's x speed while he holds ``luke_action`` and is not pushing into a wall."""
+        params = self.params
+        dx = 0
+        if luke_action & ACTION_LEFT:
+            dx -= params.player_speed
+        if luke_action & ACTION_RIGHT:
+            dx += params.player_speed
+        if (dx < 0 and self.luke_x == 0) or (dx > 0 and self.luke_x == SCREEN_WIDTH_FX - params.player_width):
+            return 0
+        return dx
+
+    def _frames_to_next_event(self, luke_action, limit):
+        """Return the first frame (1..limit) that cannot be skipped by ``_drift``."""
+        if luke_action & ACTION_FIRE:
+            return 1
+        params = self.params
+
+        # Vader's shot and his next wall bounce
+        event = min(limit, params.vader_shot_interval - self.vader_shot_timer)
+        vader_vx = params.dodger_speed * self.vader_direction
+        if vader_vx > 0:
+            event = min(event, (SCREEN_WIDTH_FX - params.dodger_width - self.vader_x) // vader_vx + 1)
+        elif vader_vx < 0:
+            event = min(event, self.vader_x // -vader_vx + 1)
+
+        # Luke reaching a wall
+        luke_vx = self._luke_velocity(luke_action)
+        if luke_vx > 0:
+            event = min(event, (SCREEN_WIDTH_FX - params.player_width - self.luke_x) // luke_vx + 1)
+        elif luke_vx < 0:
+            event = min(event, self.luke_x // -luke_vx + 1)
+
+        # Beams leaving the screen or hitting someone; motion is linear until ``event``
+        for x, y in self.player_beams:
+            event = min(event, y // -params.player_beam_speed + 1,
+                        _first_overlap_frame(x, 0, y, params.player_beam_speed, BEAM_WIDTH_FX, BEAM_HEIGHT_FX,
+                                             self.vader_x, vader_vx, self.vader_y, 0,
+                                             params.dodger_width, params.dodger_height))
+        for x, y in self.vader_beams:
+            event = min(event, (SCREEN_HEIGHT_FX - y) // params.dodger_beam_speed + 1,
+                        _first_overlap_frame(x, 0, y, params.dodger_beam_speed, BEAM_WIDTH_FX, BEAM_HEIGHT_FX,
+                                             self.luke_x, luke_vx, self.luke_y, 0,
+                                             params.player_width, params.player_height))
+        # After a switch to tighter params an event can be overdue; it happens on the next frame
+        return max(event, 1)
+
+    def _drift(self, frames, luke_action):
+        """Move everything linearly for ``frames`` frames known to contain no event."""
+        params = self.params
+        self.tick += frames
+        self.luke_x += self._luke_velocity(luke_action) * frames
+        self.vader_x += params.dodger_speed * self.vader_direction * frames
+        self.vader_shot_timer += frames
+        self.player_beams.shift(params.player_beam_speed * frames)
+        self.vader_beams.shift(params.dodger_beam_speed * frames)
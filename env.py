@@ -0,0 +1,143 @@
+"""Gym-style training environment for Vader's dodging AI.
+
+``DodgeballEnv`` follows the gymnasium ``reset()``/``step()`` conventions
+without depending on gymnasium: the agent plays Vader, a scripted Luke
+shoots at him, and observations are written into one preallocated float
+buffer that every call returns again. Training loops that keep an
+observation across steps must copy it (``np.frombuffer(obs, np.float32)``
+gives a zero-copy NumPy view of the current one).
+"""
+
+from array import array
+from collections import namedtuple
+
+from duel import (
+    SCREEN_WIDTH_FX, SCREEN_HEIGHT_FX, DEFAULT_PARAMS,
+    ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE, DuelWorld,
+)
+
+# Minimal stand-ins for gymnasium's Box and Discrete spaces
+Box = namedtuple("Box", "low high shape")
+Discrete = namedtuple("Discrete", "n")
+
+# Vader's actions: move left, stand still, move right
+VADER_ACTIONS = (-1, 0, 1)
+
+# Rewards
+SURVIVE_REWARD = 0.01 # Every frame Vader is still standing
+HIT_PENALTY = -1.0 # Luke's beam hits Vader
+WIN_REWARD = 1.0 # Vader's beam hits Luke
+
+LUKE_FIRE_CHANCE = 0.05 # Per frame, for the scripted Luke
+
+# Floats per beam in the observation: x offset, y offset, present flag
+BEAM_FIELDS = 3
+
+
+def chasing_luke(world):
+    """Scripted Luke: walk under Vader and fire at random (drawing from ``world.rng``)."""
+    luke_action = ACTION_NONE
+    params = world.params
+    offset = (world.vader_x + params.dodger_width // 2) - (world.luke_x + params.player_width // 2)
+    if offset < -params.player_speed:
+        luke_action |= ACTION_LEFT
+    elif offset > params.player_speed:
+        luke_action |= ACTION_RIGHT
+    if world.rng.random() < LUKE_FIRE_CHANCE:
+        luke_action |= ACTION_FIRE
+    return luke_action
+
+
+class DodgeballEnv:
+    """Vader's side of the duel.
+
+    Actions index ``VADER_ACTIONS``. The observation holds, all scaled to
+    [-1, 1]: Vader's x, his direction, Luke's x, then for the
+    ``nearest_beams`` of Luke's beams closest to Vader (nearest first) their
+    x and y offset from Vader's centre and a flag that is 1.0 for a real
+    beam and 0.0 for padding.
+
+    An episode ends when either side is hit, or is truncated after
+    ``max_steps`` frames. ``params`` sets the difficulty (see
+    ``scenarios``); it can also be changed between episodes through
+    ``world.params``, within the beam capacity the world was made with.
+    """
+
+    def __init__(self, nearest_beams=4, max_steps=3600, luke_policy=chasing_luke, seed=None, params=DEFAULT_PARAMS):
+        self.world = DuelWorld(seed=seed, params=params)
+        self.nearest_beams = nearest_beams
+        self.max_steps = max_steps
+        self.luke_policy = luke_policy
+        self.steps = 0
+        size = 3 + BEAM_FIELDS * nearest_beams
+        self.observation = array('f', bytes(4 * size))
+        self.observation_space = Box(-1.0, 1.0, (size,))
+        self.action_space = Discrete(len(VADER_ACTIONS))
+        self.info = {}
+        # Scratch space for picking the nearest beams without allocating
+        self._nearest_distance = [0] * nearest_beams
+        self._nearest_dx = [0] * nearest_beams
+        self._nearest_dy = [0] * nearest_beams
+
+    def reset(self, seed=None):
+        """Start a new episode and return ``(observation, info)``."""
+        self.world.reset(seed)
+        self.steps = 0
+        self._observe()
+        return self.observation, self.info
+
+    def step(self, action):
+        """Play one frame and return ``(observation, reward, terminated, truncated, info)``."""
+        world = self.world
+        world.step(self.luke_policy(world), VADER_ACTIONS[action])
+        self.steps += 1
+        if world.game_over:
+            reward = HIT_PENALTY if world.luke_won else WIN_REWARD
+        else:
+            reward = SURVIVE_REWARD
+        truncated = not world.game_over and self.steps >= self.max_steps
+        self._observe()
+        return self.observation, reward, world.game_over, truncated, self.info
+
+    def _observe(self):
+        world = self.world
+        params = world.params
+        obs = self.observation
+        obs[0] = world.vader_x / (SCREEN_WIDTH_FX - params.dodger_width) * 2 - 1
+        obs[1] = world.vader_direction
+        obs[2] = world.luke_x / (SCREEN_WIDTH_FX - params.player_width) * 2 - 1
+
+        # Keep the nearest beams in sorted order by insertion
+        n = self.nearest_beams
+        distances, dxs, dys = self._nearest_distance, self._nearest_dx, self._nearest_dy
+        found = 0
+        # Beam positions are compared with a beam centred on Vader
+        center_x = world.vader_x + params.vader_beam_offset
+        center_y = world.vader_y + params.dodger_height // 2
+        for x, y in world.player_beams:
+            dx = x - center_x
+            dy = y - center_y
+            distance = dx * dx + dy * dy
+            if found == n and distance >= distances[n - 1]:
+                continue
+            i = found if found < n else n - 1
+            while i > 0 and distances[i - 1] > distance:
+                distances[i] = distances[i - 1]
+                dxs[i] = dxs[i - 1]
+                dys[i] = dys[i - 1]
+                i -= 1
+            distances[i] = distance
+            dxs[i] = dx
+            dys[i] = dy
+            if found < n:
+                found += 1
+
+        j = 3
+        for i in range(n):
+            if i < found:
+                obs[j] = dxs[i] / SCREEN_WIDTH_FX
+                obs[j + 1] = dys[i] / SCREEN_HEIGHT_FX
+                obs[j + 2] = 1.0
+            else:
+                obs[j] = obs[j + 1] = obs[j + 2] = 0.0
+            j += BEAM_FIELDS
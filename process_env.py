@@ -0,0 +1,171 @@
+"""Many ``DodgeballEnv``s spread over worker processes.
+
+Each worker owns a contiguous slice of the environments. Observations,
+rewards and done flags live in one ``multiprocessing.shared_memory`` block
+that workers write in place; the actions are in the same block. Only a
+one-byte command per worker crosses the pipe each step, so nothing is
+pickled while training runs.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+from env import VADER_ACTIONS, DodgeballEnv
+
+# Commands sent to workers
+_STEP = b's'
+_RESET = b'r'
+_CLOSE = b'c'
+_DONE = b'k' # Worker reply once its slice is written
+
+
+class _Layout:
+    """Byte offsets of the arrays inside the shared block."""
+
+    def __init__(self, num_envs, observation_size):
+        self.observation_size = observation_size
+        self.observations = 0
+        self.rewards = self.observations + 4 * num_envs * observation_size
+        self.terminated = self.rewards + 4 * num_envs
+        self.truncated = self.terminated + num_envs
+        self.actions = self.truncated + num_envs
+        self.size = self.actions + num_envs
+
+    def views(self, buf, num_envs):
+        """Return (observations, rewards, terminated, truncated, actions) memoryviews over ``buf``."""
+        buf = memoryview(buf)
+        return (buf[self.observations:self.rewards].cast('f'),
+                buf[self.rewards:self.terminated].cast('f'),
+                buf[self.terminated:self.truncated],
+                buf[self.truncated:self.actions],
+                buf[self.actions:self.size])
+
+
+def _worker(conn, shm_name, layout, num_envs, start, stop, seed, env_kwargs):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    observations, rewards, terminated, truncated, actions = layout.views(shm.buf, num_envs)
+    size = layout.observation_size
+    envs = [DodgeballEnv(seed=None if seed is None else seed + i, **env_kwargs) for i in range(start, stop)]
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == _STEP:
+                for i, env in enumerate(envs, start):
+                    obs, reward, term, trunc, _ = env.step(actions[i])
+                    if term or trunc:
+                        obs, _ = env.reset()
+                    observations[i * size:(i + 1) * size] = obs
+                    rewards[i] = reward
+                    terminated[i] = term
+                    truncated[i] = trunc
+            elif command == _RESET:
+                for i, env in enumerate(envs, start):
+                    obs, _ = env.reset()
+                    observations[i * size:(i + 1) * size] = obs
+                    rewards[i] = 0.0
+                    terminated[i] = truncated[i] = 0
+            else:
+                break
+            conn.send_bytes(_DONE)
+    finally:
+        del observations, rewards, terminated, truncated, actions
+        shm.close()
+
+
+class ProcessVectorEnv:
+    """``num_envs`` Dodgeball environments stepped by ``num_workers`` processes.
+
+    ``observations`` is a flat float32 view of ``num_envs`` observations
+    back to back; ``rewards`` (float32), ``terminated`` and ``truncated``
+    (one byte each) hold one entry per environment. All of them are views
+    into shared memory, overwritten by the next ``step()``. A finished
+    environment is reset right away, so its slot already holds the first
+    observation of the next episode. Environment ``i`` is seeded with
+    ``seed + i`` (or left unseeded when ``seed`` is None); extra keyword
+    arguments go to ``DodgeballEnv``.
+
+    Use as a context manager, or call ``close()`` when done.
+    """
+
+    def __init__(self, num_envs, num_workers=None, seed=0, **env_kwargs):
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        observation_size = DodgeballEnv(**env_kwargs).observation_space.shape[0]
+        self.num_envs = num_envs
+        self.observation_size = observation_size
+        layout = _Layout(num_envs, observation_size)
+        self._shm = shared_memory.SharedMemory(create=True, size=layout.size)
+        (self.observations, self.rewards, self.terminated, self.truncated,
+         self._actions) = layout.views(self._shm.buf, num_envs)
+
+        self._conns = []
+        self._processes = []
+        for w in range(num_workers):
+            start = num_envs * w // num_workers
+            stop = num_envs * (w + 1) // num_workers
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker, args=(child, self._shm.name, layout, num_envs, start, stop, seed, env_kwargs),
+                daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def _broadcast(self, command):
+        for conn in self._conns:
+            conn.send_bytes(command)
+        for conn in self._conns:
+            conn.recv_bytes()
+
+    def reset(self):
+        """Reset every environment and return the observations view."""
+        self._broadcast(_RESET)
+        return self.observations
+
+    def step(self, actions):
+        """Step every environment with one Vader action each.
+
+        ``actions`` is any sequence of ints, e.g. a list or a NumPy array of
+        any integer dtype. Returns ``(observations, rewards, terminated,
+        truncated)`` views.
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(f"expected {self.num_envs} actions, got {len(actions)}")
+        # Element by element: bytes() of an array would copy its raw buffer
+        try:
+            packed = bytes(map(int, actions))
+        except ValueError: # Below 0 or above 255
+            packed = None
+        if packed is None or (packed and max(packed) >= len(VADER_ACTIONS)):
+            raise ValueError(f"actions must be in 0..{len(VADER_ACTIONS) - 1}")
+        self._actions[:] = packed
+        self._broadcast(_STEP)
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        if self._shm is None:
+            return
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self.observations.release()
+        self.rewards.release()
+        self.terminated.release()
+        self.truncated.release()
+        self._actions.release()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,251 @@
+"""Drawing helpers for the pygame client.
+
+``DirtyRects`` redraws only the parts of the window that changed: each frame
+it clears what the previous frame drew and pushes just those regions plus
+the new ones to the display, instead of filling and flipping the whole
+window for two sprites and a few beams.
+
+``BeamSprite`` pre-renders a beam once per color, so all the beams of one
+color are drawn with a single ``DirtyRects.blits()`` call however many there
+are.
+
+``TextCache`` keeps rendered text, so labels that show every frame are
+antialiased once instead of 60 times a second; wrapped paragraphs (laid out
+by ``wrap_text()``) are kept as one finished surface.
+"""
+
+import functools
+from collections import OrderedDict
+from itertools import repeat
+
+import pygame
+
+from duel import FIXED_SHIFT, FIXED_ONE
+
+# Past this many regions in one frame, one full clear and flip is cheaper
+MAX_DIRTY_RECTS = 256
+
+# Rendered strings kept by a TextCache; the menu and game need a few dozen
+TEXT_CACHE_SIZE = 128
+
+# Layouts memoized by wrap_text()
+WRAP_CACHE_SIZE = 64
+
+# Opacity of a beam's glow right next to the beam; it fades out from there
+GLOW_ALPHA = 120
+
+
+class DirtyRects:
+    """Tracks what was drawn on ``screen`` over a solid ``background`` color.
+
+    A frame is ``begin()``, any number of ``blit()``/``rect()`` calls, then
+    ``present()``. ``begin()`` paints the background over everything the
+    previous frame drew; ``present()`` sends those regions and the new ones
+    to the display with ``pygame.display.update()``. After ``invalidate()``,
+    or in every frame when ``full_redraw`` is set, the whole window is
+    cleared and flipped instead.
+    """
+
+    def __init__(self, screen, background, full_redraw=False):
+        self.screen = screen
+        self.background = background
+        self.full_redraw = full_redraw
+        self._full = True # The window holds something we didn't draw
+        self._drawn = [] # Regions drawn this frame
+        self._erased = [] # Regions drawn last frame and cleared by begin()
+        # fblits() is pygame-ce's fastest way to blit many surfaces; plain pygame has blits()
+        self._blit_all = getattr(screen, "fblits", None) or functools.partial(screen.blits, doreturn=False)
+
+    def invalidate(self):
+        """Clear and flip the whole window next frame, e.g. after it was exposed or drawn over."""
+        self._full = True
+
+    def begin(self):
+        """Erase the previous frame's drawing."""
+        if self._full or self.full_redraw or len(self._drawn) > MAX_DIRTY_RECTS:
+            self._full = True
+            self.screen.fill(self.background)
+            self._erased = []
+        else:
+            fill, background = self.screen.fill, self.background
+            for region in self._drawn:
+                fill(background, region)
+            self._erased = self._drawn
+        self._drawn = []
+
+    def blit(self, surface, dest):
+        """Blit ``surface`` at ``dest`` and return the region it covered."""
+        region = self.screen.blit(surface, dest)
+        self._drawn.append(region)
+        return region
+
+    def blits(self, surface, dests):
+        """Blit ``surface`` at each top-left corner in ``dests`` with one call.
+
+        Each blit is still recorded as its own dirty region, so a few beams
+        scattered over the window don't make the next frame clear and push
+        everything between them. Past ``MAX_DIRTY_RECTS`` blits the whole
+        screen is recorded instead. Returns the regions recorded.
+        """
+        if not dests:
+            return []
+        self._blit_all(zip(repeat(surface), dests))
+        if len(dests) > MAX_DIRTY_RECTS:
+            regions = [self.screen.get_rect()]
+        else:
+            regions = list(map(pygame.Rect, dests, repeat(surface.get_size())))
+        self._drawn.extend(regions)
+        return regions
+
+    def rect(self, color, rect):
+        """Fill ``rect`` with ``color`` and return the region it covered."""
+        region = pygame.draw.rect(self.screen, color, rect)
+        self._drawn.append(region)
+        return region
+
+    def present(self):
+        """Push this frame to the display."""
+        if self._full or len(self._drawn) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
+            self._full = False
+        else:
+            pygame.display.update(self._erased + self._drawn)
+
+
+class BeamSprite:
+    """A ``width`` x ``height`` beam of ``color``, rendered once for blitting many times.
+
+    With ``glow`` > 0 the beam also gets a soft halo ``glow`` pixels wide,
+    fading out from ``GLOW_ALPHA``. Create it once a display is open, so the
+    surface is converted to the display's format.
+    """
+
+    def __init__(self, color, width, height, glow=0):
+        self.glow = glow
+        if glow:
+            surface = pygame.Surface((width + 2 * glow, height + 2 * glow), pygame.SRCALPHA)
+            # Outermost ring first; each ring inside it replaces its middle with a stronger one
+            for ring in range(glow, 0, -1):
+                alpha = GLOW_ALPHA * (glow - ring + 1) // (glow + 1)
+                pygame.draw.rect(surface, (*color, alpha),
+                                 (glow - ring, glow - ring, width + 2 * ring, height + 2 * ring), border_radius=ring)
+            surface.fill(color, (glow, glow, width, height))
+            self.surface = surface.convert_alpha()
+        else:
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            self.surface = surface.convert()
+
+    def dests(self, beams, lag=0):
+        """Where to blit ``surface`` for each (x, y) corner in ``beams``, drawn ``lag`` units behind.
+
+        ``beams`` is in ``duel``'s fixed-point units, e.g. a ``BeamPool``;
+        the result is pixel corners, rounded like ``duel.to_pixels()``.
+        """
+        x_round = FIXED_ONE // 2 - (self.glow << FIXED_SHIFT)
+        y_round = x_round - lag
+        return [((x + x_round) >> FIXED_SHIFT, (y + y_round) >> FIXED_SHIFT) for x, y in beams]
+
+
+class TextCache:
+    """Rendered text surfaces, keyed by ``(font, text, antialias, color)``.
+
+    Holds at most ``max_entries`` surfaces and drops the least recently
+    used one past that, so changing text such as the HUD's tick rate can't
+    grow it without bound. ``hits`` and ``misses`` count ``render()`` calls
+    served from the cache and rendered anew.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, antialias, color, **position):
+        """Return ``(surface, rect)`` for ``font.render(text, antialias, color)``.
+
+        The surface is shared and must not be drawn on. ``rect`` is a new
+        ``surface.get_rect(**position)``, e.g. ``center=(x, y)``.
+        """
+        key = (font, text, antialias, color)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = self._store(key, font.render(text, antialias, color))
+        return surface, surface.get_rect(**position)
+
+    def paragraph(self, font, text, antialias, color, max_width, line_step, **position):
+        """Return ``(surface, rect)`` for ``text`` wrapped to ``max_width`` and drawn as one surface.
+
+        Lines from ``wrap_text()`` are ``line_step`` pixels apart and centered
+        on each other, exactly as if each were blitted on its own with
+        ``center`` x positions equal. The whole paragraph counts as one entry.
+        """
+        key = (font, text, antialias, color, max_width, line_step)
+        surface = self._lookup(key)
+        if surface is None:
+            lines = [font.render(line, antialias, color) for line in wrap_text(text, font, max_width)]
+            width = max(line.get_width() for line in lines)
+            height = max(i * line_step + line.get_height() for i, line in enumerate(lines))
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for i, line in enumerate(lines):
+                # Lines never overlap, so MAX copies each one's pixels and alpha onto the transparent surface as is
+                surface.blit(line, (width // 2 - line.get_width() // 2, i * line_step),
+                             special_flags=pygame.BLEND_RGBA_MAX)
+            surface = self._store(key, surface)
+        return surface, surface.get_rect(**position)
+
+    def _lookup(self, key):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def _store(self, key, surface):
+        self.misses += 1
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+@functools.lru_cache(maxsize=None)
+def _space_width(font):
+    return font.size(" ")[0]
+
+
+@functools.lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_text(text, font, max_width):
+    """Split ``text`` into lines at most ``max_width`` pixels wide in ``font``; return them as a tuple.
+
+    Each word is measured once, and a line's width is the sum of its words
+    and the (cached) width of the spaces between them. Rounding makes that
+    sum differ from measuring the whole line by up to about a pixel per
+    piece, so a line that comes within that margin of ``max_width`` is
+    measured whole, and lines break exactly where measuring every candidate
+    line would. Results are memoized per ``(text, font, max_width)``.
+    """
+    space_width = _space_width(font)
+    lines = []
+    current_line = []
+    line_width = 0
+    for word in text.split(" "):
+        word_width = font.size(word)[0]
+        width = line_width + space_width + word_width if current_line else word_width
+        margin = 2 * len(current_line) + 1 # One pixel per word and space measured
+        if width + margin <= max_width:
+            fits = True
+        elif width - margin > max_width:
+            fits = False
+        else:
+            fits = font.size(" ".join(current_line + [word]))[0] <= max_width
+        if fits:
+            current_line.append(word)
+            line_width = width
+        else:
+            lines.append(" ".join(current_line))
+            current_line = [word]
+            line_width = word_width
+    lines.append(" ".join(current_line))
+    return tuple(lines)
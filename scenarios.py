@@ -0,0 +1,110 @@
+"""Difficulty tiers loaded from scenario files.
+
+A scenario file (JSON, or TOML on Python 3.11+) names a set of tiers. Each
+tier overrides some of ``duel.TUNABLES`` and takes the rest from the file's
+optional ``defaults`` table, then from the original game::
+
+    {"defaults": {"player_speed": 7},
+     "tiers": {"easy": {"dodger_speed": 3}, "hard": {"dodger_speed": 6}}}
+
+``load_scenarios()`` checks the whole file and compiles every tier into a
+``duel.DuelParams`` up front, so a typo fails at load time and switching
+tiers mid-run is a single assignment to ``DuelWorld.params``.
+"""
+
+import json
+import math
+import os
+
+try:
+    import tomllib
+except ImportError: # Python < 3.11 only reads JSON scenarios
+    tomllib = None
+
+from duel import TUNABLES, make_params
+
+# Scenario file shipped with the game
+DEFAULT_SCENARIO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "difficulty.json")
+
+
+class ScenarioTable:
+    """Compiled tiers: ``params[i]`` is the ``DuelParams`` of tier ``names[i]``.
+
+    Index with a tier's position or name. ``player_beam_capacity`` and
+    ``vader_beam_capacity`` are the most any tier needs, for a ``DuelWorld``
+    that will switch between them.
+    """
+
+    def __init__(self, names, params):
+        self.names = tuple(names)
+        self.params = tuple(params)
+        self._positions = {name: i for i, name in enumerate(self.names)}
+        self.player_beam_capacity = max(p.player_beam_capacity for p in self.params)
+        self.vader_beam_capacity = max(p.vader_beam_capacity for p in self.params)
+
+    def index(self, name):
+        """Return the position of the tier called ``name``."""
+        try:
+            return self._positions[name]
+        except KeyError:
+            raise KeyError(f"no tier {name!r}; tiers are {', '.join(self.names)}") from None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self.index(key)
+        return self.params[key]
+
+    def __len__(self):
+        return len(self.params)
+
+
+def _check_settings(settings, where):
+    if not isinstance(settings, dict):
+        raise ValueError(f"{where}: expected a table of settings")
+    for key, value in settings.items():
+        if key not in TUNABLES:
+            raise ValueError(f"{where}: unknown setting {key!r}; settings are {', '.join(TUNABLES)}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{where}: {key} must be a number")
+        if not math.isfinite(value): # JSON's Infinity/NaN and TOML's inf/nan parse as floats
+            raise ValueError(f"{where}: {key} must be a finite number")
+
+
+def compile_scenarios(data, source="scenario"):
+    """Validate parsed scenario data and compile it into a ``ScenarioTable``.
+
+    Raises ``ValueError`` naming ``source`` and the tier for anything wrong.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"{source}: expected a table with 'tiers'")
+    unknown = set(data) - {"defaults", "tiers"}
+    if unknown:
+        raise ValueError(f"{source}: unknown section {sorted(unknown)[0]!r}")
+    defaults = data.get("defaults", {})
+    _check_settings(defaults, f"{source}: defaults")
+    tiers = data.get("tiers")
+    if not isinstance(tiers, dict) or not tiers:
+        raise ValueError(f"{source}: 'tiers' must name at least one tier")
+
+    params = []
+    for name, settings in tiers.items():
+        where = f"{source}: tier {name!r}"
+        _check_settings(settings, where)
+        try:
+            params.append(make_params(**{**defaults, **settings}))
+        except ValueError as error:
+            raise ValueError(f"{where}: {error}") from None
+    return ScenarioTable(tiers, params)
+
+
+def load_scenarios(path=DEFAULT_SCENARIO_PATH):
+    """Read, validate and compile the scenario file at ``path`` (``.json`` or ``.toml``)."""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ImportError("TOML scenarios need Python 3.11 or newer (tomllib); use JSON instead")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    return compile_scenarios(data, os.path.basename(path))
@@ -0,0 +1,272 @@
+"""Many independent duels stepped together in one call.
+
+``VectorDuel`` keeps the state of N duels in flat arrays instead of N
+``DuelWorld`` objects, so a training loop can advance thousands of games per
+Python call. NumPy is used when it is installed; otherwise the same arrays are
+kept in the standard ``array`` module and stepped with a plain loop. Only
+NumPy gives the large speedup, 10-30x per duel over ``DuelWorld`` for a
+thousand duels or more. The ``array`` fallback is still one Python iteration
+per duel per frame and measures only about 1.5-2.5x.
+
+Each duel follows the rules of ``duel.DuelWorld`` with the original game's
+settings (``duel.DEFAULT_PARAMS``). Beams live in fixed slots per duel. Luke
+can fire at most once per frame and all his beams fly at the same speed, so
+his beams sit in a ring indexed by the frame they were fired on: a slot's
+height is the same in every duel, a new shot overwrites the beam that is
+just leaving the screen, and only the few slots level with Vader need a hit
+test.
+"""
+
+from array import array
+
+from duel import (
+    VADER_SHOT_INTERVAL, SCREEN_WIDTH_FX, SCREEN_HEIGHT_FX, BEAM_WIDTH_FX, BEAM_HEIGHT_FX,
+    PLAYER_BEAM_SPEED_FX, DODGER_BEAM_SPEED_FX,
+    PLAYER_WIDTH_FX, PLAYER_HEIGHT_FX, PLAYER_SPEED_FX, initial_luke_x_fx, initial_luke_y_fx,
+    DODGER_WIDTH_FX, DODGER_HEIGHT_FX, DODGER_SPEED_FX, initial_vader_x_fx, initial_vader_y_fx,
+    PLAYER_BEAM_OFFSET_FX, VADER_BEAM_OFFSET_FX,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_FIRE,
+)
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional
+    np = None
+
+# Frames one of Luke's beams stays on screen, which is also the ring size
+PLAYER_BEAM_SLOTS = initial_luke_y_fx // -PLAYER_BEAM_SPEED_FX
+# Most of Vader's beams that can be on screen at once in one duel
+VADER_BEAM_SLOTS = ((SCREEN_HEIGHT_FX - initial_vader_y_fx - DODGER_HEIGHT_FX) // DODGER_BEAM_SPEED_FX
+                    // VADER_SHOT_INTERVAL + 2)
+
+# Where Vader's beams spawn, in simulation units
+VADER_BEAM_Y = initial_vader_y_fx + DODGER_HEIGHT_FX
+
+# Height of Luke's beam after it has moved for ``age + 1`` frames, in simulation units
+PLAYER_BEAM_Y_BY_AGE = [initial_luke_y_fx + PLAYER_BEAM_SPEED_FX * (age + 1) for age in range(PLAYER_BEAM_SLOTS)]
+# Ages at which Luke's beam overlaps Vader's row
+PLAYER_BEAM_HIT_AGES = [age for age, y in enumerate(PLAYER_BEAM_Y_BY_AGE)
+                        if y < initial_vader_y_fx + DODGER_HEIGHT_FX and y + BEAM_HEIGHT_FX > initial_vader_y_fx]
+
+
+class VectorDuel:
+    """N duels whose positions, timers and beams are stored in flat arrays.
+
+    Per-duel arrays (length ``n``): ``luke_x``, ``vader_x``,
+    ``vader_direction``, ``vader_shot_timer``, ``vader_alive``,
+    ``game_over``. Beam arrays hold ``n * PLAYER_BEAM_SLOTS`` (or
+    ``VADER_BEAM_SLOTS``) entries; with NumPy they are shaped
+    ``(n, slots)``. Positions are in ``duel``'s fixed-point simulation
+    units and match ``DuelWorld`` bit for bit. Luke's beam heights are
+    shared by all duels, see ``player_beam_y()``.
+
+    Finished duels stop moving until ``reset()`` is called for them; their
+    beams are only meaningful up to the frame the duel ended.
+    """
+
+    def __init__(self, n, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ImportError("VectorDuel(use_numpy=True) needs NumPy installed")
+        self.n = n
+        self.use_numpy = use_numpy
+        self.tick = 0
+        if use_numpy:
+            self._rows = np.arange(n)
+            self.luke_x = np.empty(n, np.int32)
+            self.vader_x = np.empty(n, np.int32)
+            self.vader_direction = np.empty(n, np.int32)
+            self.vader_shot_timer = np.empty(n, np.int32)
+            self.vader_alive = np.empty(n, bool)
+            self.game_over = np.empty(n, bool)
+            self.player_beam_x = np.zeros((n, PLAYER_BEAM_SLOTS), np.int32)
+            self.player_beam_active = np.zeros((n, PLAYER_BEAM_SLOTS), bool)
+            self.vader_beam_x = np.zeros((n, VADER_BEAM_SLOTS), np.int32)
+            self.vader_beam_y = np.zeros((n, VADER_BEAM_SLOTS), np.int32)
+            self.vader_beam_active = np.zeros((n, VADER_BEAM_SLOTS), bool)
+        else:
+            self.luke_x = array('i', bytes(4 * n))
+            self.vader_x = array('i', bytes(4 * n))
+            self.vader_direction = array('i', bytes(4 * n))
+            self.vader_shot_timer = array('i', bytes(4 * n))
+            self.vader_alive = array('b', bytes(n))
+            self.game_over = array('b', bytes(n))
+            self.player_beam_x = array('i', bytes(4 * n * PLAYER_BEAM_SLOTS))
+            self.player_beam_active = array('b', bytes(n * PLAYER_BEAM_SLOTS))
+            self.vader_beam_x = array('i', bytes(4 * n * VADER_BEAM_SLOTS))
+            self.vader_beam_y = array('i', bytes(4 * n * VADER_BEAM_SLOTS))
+            self.vader_beam_active = array('b', bytes(n * VADER_BEAM_SLOTS))
+        self.reset()
+
+    def reset(self, indices=None):
+        """Restart the given duels (all of them when ``indices`` is None)."""
+        if self.use_numpy:
+            if indices is None:
+                indices = slice(None)
+            self.luke_x[indices] = initial_luke_x_fx
+            self.vader_x[indices] = initial_vader_x_fx
+            self.vader_direction[indices] = 1
+            self.vader_shot_timer[indices] = 0
+            self.vader_alive[indices] = True
+            self.game_over[indices] = False
+            self.player_beam_active[indices] = False
+            self.vader_beam_active[indices] = False
+            return
+        if indices is None:
+            indices = range(self.n)
+        for i in indices:
+            self.luke_x[i] = initial_luke_x_fx
+            self.vader_x[i] = initial_vader_x_fx
+            self.vader_direction[i] = 1
+            self.vader_shot_timer[i] = 0
+            self.vader_alive[i] = 1
+            self.game_over[i] = 0
+            for s in range(i * PLAYER_BEAM_SLOTS, (i + 1) * PLAYER_BEAM_SLOTS):
+                self.player_beam_active[s] = 0
+            for s in range(i * VADER_BEAM_SLOTS, (i + 1) * VADER_BEAM_SLOTS):
+                self.vader_beam_active[s] = 0
+
+    def player_beam_y(self):
+        """Return the current height of each of Luke's beam slots."""
+        last = (self.tick - 1) % PLAYER_BEAM_SLOTS
+        return [PLAYER_BEAM_Y_BY_AGE[(last - s) % PLAYER_BEAM_SLOTS] for s in range(PLAYER_BEAM_SLOTS)]
+
+    def step(self, actions):
+        """Advance every unfinished duel by one frame.
+
+        ``actions`` holds one ``ACTION_*`` bitmask per duel. Returns the
+        ``game_over`` array.
+        """
+        fire_slot = self.tick % PLAYER_BEAM_SLOTS
+        hit_slots = [(fire_slot - age) % PLAYER_BEAM_SLOTS for age in PLAYER_BEAM_HIT_AGES]
+        self.tick += 1
+        if self.use_numpy:
+            self._step_numpy(np.asarray(actions), fire_slot, hit_slots)
+        else:
+            self._step_array(actions, fire_slot, hit_slots)
+        return self.game_over
+
+    def _step_numpy(self, actions, fire_slot, hit_slots):
+        live = ~self.game_over
+
+        # Luke fires into this frame's ring slot, replacing the beam leaving the screen
+        self.player_beam_x[:, fire_slot] = self.luke_x + PLAYER_BEAM_OFFSET_FX
+        self.player_beam_active[:, fire_slot] = live & ((actions & ACTION_FIRE) != 0)
+
+        # Luke's horizontal movement, kept within screen bounds
+        dx = ((actions & ACTION_RIGHT) != 0).astype(np.int32) - ((actions & ACTION_LEFT) != 0)
+        luke_x = self.luke_x
+        luke_x += dx * PLAYER_SPEED_FX * live
+        np.clip(luke_x, 0, SCREEN_WIDTH_FX - PLAYER_WIDTH_FX, out=luke_x)
+
+        # Vader bounces off the screen edges (a live duel always has Vader alive)
+        vader_x = self.vader_x
+        vader_x += DODGER_SPEED_FX * self.vader_direction * live
+        hit_left = vader_x < 0
+        hit_right = vader_x > SCREEN_WIDTH_FX - DODGER_WIDTH_FX
+        vader_x[hit_left] = 0
+        vader_x[hit_right] = SCREEN_WIDTH_FX - DODGER_WIDTH_FX
+        self.vader_direction[hit_left] = 1
+        self.vader_direction[hit_right] = -1
+
+        # Vader's shooting logic
+        self.vader_shot_timer += live
+        shoot = self.vader_shot_timer >= VADER_SHOT_INTERVAL
+        if shoot.any():
+            self.vader_shot_timer[shoot] = 0
+            rows = self._rows
+            slot = np.argmin(self.vader_beam_active, axis=1)
+            shoot &= ~self.vader_beam_active[rows, slot]
+            r, s = rows[shoot], slot[shoot]
+            self.vader_beam_x[r, s] = vader_x[shoot] + VADER_BEAM_OFFSET_FX
+            self.vader_beam_y[r, s] = VADER_BEAM_Y
+            self.vader_beam_active[r, s] = True
+
+        # Luke's beams level with Vader: only their x needs testing
+        bx = self.player_beam_x[:, hit_slots]
+        vx = vader_x[:, None]
+        hit = (self.player_beam_active[:, hit_slots] & live[:, None]
+               & (bx < vx + DODGER_WIDTH_FX) & (bx + BEAM_WIDTH_FX > vx))
+        vader_hit = hit.any(axis=1)
+        if vader_hit.any():
+            self.player_beam_active[:, hit_slots] &= ~hit
+            self.vader_alive &= ~vader_hit
+            self.game_over |= vader_hit
+
+        # Vader's beams: move, hit Luke, leave the screen
+        active = self.vader_beam_active & live[:, None]
+        bx, by = self.vader_beam_x, self.vader_beam_y
+        by += DODGER_BEAM_SPEED_FX * active
+        lx = luke_x[:, None]
+        hit = (active
+               & (bx < lx + PLAYER_WIDTH_FX) & (bx + BEAM_WIDTH_FX > lx)
+               & (by < initial_luke_y_fx + PLAYER_HEIGHT_FX) & (by + BEAM_HEIGHT_FX > initial_luke_y_fx))
+        self.vader_beam_active &= ~hit & (by <= SCREEN_HEIGHT_FX)
+        self.game_over |= hit.any(axis=1)
+
+    def _step_array(self, actions, fire_slot, hit_slots):
+        luke_xs, vader_xs = self.luke_x, self.vader_x
+        directions, timers = self.vader_direction, self.vader_shot_timer
+        vader_alive, game_over = self.vader_alive, self.game_over
+        pbx, pba = self.player_beam_x, self.player_beam_active
+        vbx, vby, vba = self.vader_beam_x, self.vader_beam_y, self.vader_beam_active
+        for i in range(self.n):
+            p0 = i * PLAYER_BEAM_SLOTS
+            if game_over[i]:
+                pba[p0 + fire_slot] = 0
+                continue
+            action = actions[i]
+            luke_x = luke_xs[i]
+            pbx[p0 + fire_slot] = luke_x + PLAYER_BEAM_OFFSET_FX
+            pba[p0 + fire_slot] = 1 if action & ACTION_FIRE else 0
+
+            if action & ACTION_LEFT:
+                luke_x -= PLAYER_SPEED_FX
+            if action & ACTION_RIGHT:
+                luke_x += PLAYER_SPEED_FX
+            if luke_x < 0:
+                luke_x = 0
+            elif luke_x > SCREEN_WIDTH_FX - PLAYER_WIDTH_FX:
+                luke_x = SCREEN_WIDTH_FX - PLAYER_WIDTH_FX
+            luke_xs[i] = luke_x
+
+            vader_x = vader_xs[i] + DODGER_SPEED_FX * directions[i]
+            if vader_x < 0:
+                vader_x = 0
+                directions[i] = 1
+            elif vader_x > SCREEN_WIDTH_FX - DODGER_WIDTH_FX:
+                vader_x = SCREEN_WIDTH_FX - DODGER_WIDTH_FX
+                directions[i] = -1
+            vader_xs[i] = vader_x
+
+            v0 = i * VADER_BEAM_SLOTS
+            v1 = v0 + VADER_BEAM_SLOTS
+            timer = timers[i] + 1
+            if timer >= VADER_SHOT_INTERVAL:
+                timer = 0
+                for s in range(v0, v1):
+                    if not vba[s]:
+                        vbx[s] = vader_x + VADER_BEAM_OFFSET_FX
+                        vby[s] = VADER_BEAM_Y
+                        vba[s] = 1
+                        break
+            timers[i] = timer
+
+            for s in hit_slots:
+                s += p0
+                if pba[s] and pbx[s] < vader_x + DODGER_WIDTH_FX and pbx[s] + BEAM_WIDTH_FX > vader_x:
+                    pba[s] = 0
+                    vader_alive[i] = 0
+                    game_over[i] = 1
+
+            for s in range(v0, v1):
+                if vba[s]:
+                    x = vbx[s]
+                    y = vby[s] = vby[s] + DODGER_BEAM_SPEED_FX
+                    if (x < luke_x + PLAYER_WIDTH_FX and x + BEAM_WIDTH_FX > luke_x
+                            and y < initial_luke_y_fx + PLAYER_HEIGHT_FX and y + BEAM_HEIGHT_FX > initial_luke_y_fx):
+                        vba[s] = 0
+                        game_over[i] = 1
+                    elif y > SCREEN_HEIGHT_FX:
+                        vba[s] = 0